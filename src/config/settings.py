@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 import os
+import tempfile
 from pathlib import Path
 import environ
 
@@ -27,7 +28,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = 'django-insecure-)7_cml2jx&yxdh+@+dgkbjbfw-+legr@cp^5j-)t70y01*sys9'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = env.bool('DEBUG', default=True)
 
 ALLOWED_HOSTS = []
 
@@ -41,6 +42,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     'rest_framework',
     # Swagger Documentation
@@ -91,12 +93,36 @@ DATABASES = {
         'NAME': env('POSTGRES_NAME'),
         'USER': env('POSTGRES_USER'),
         'PASSWORD': env('POSTGRES_PASSWORD'),
-        'HOST': '127.0.0.1',
-        'PORT': 5432,
+        'HOST': env('POSTGRES_HOST', default='127.0.0.1'),
+        'PORT': env.int('POSTGRES_PORT', default=5432),
+        'CONN_MAX_AGE': env.int('POSTGRES_CONN_MAX_AGE', default=0),
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# The cache is shared between the sync command and the API workers (data version,
+# search caches, throttling counters), so the default backend is on disk rather than per
+# process. Set MEMCACHED_LOCATION (host:port) in production: the throttling counters need
+# increments that are atomic across processes, which the file cache doesn't have.
+
+if env('MEMCACHED_LOCATION', default=None):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': env('MEMCACHED_LOCATION'),
+        },
+    }
+else:
+    CACHES = {
+        'default': env.cache(
+            'CACHE_URL',
+            default=f'filecache://{tempfile.gettempdir()}/fever-provider-api-cache?max_entries=10000',
+        ),
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -134,8 +160,89 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/3.2/howto/static-files/
 
 STATIC_URL = '/static/'
+# Where collectstatic gathers the static files (the Swagger UI) served by WhiteNoise in production.
+STATIC_ROOT = env('STATIC_ROOT', default=os.path.join(tempfile.gettempdir(), 'fever-provider-static'))
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Events integration
+
+# Seconds between two syncs with the external provider (sync_external_provider schedule).
+EXTERNAL_PROVIDER_SYNC_INTERVAL = env.int('EXTERNAL_PROVIDER_SYNC_INTERVAL', default=300)
+# Cache-Control max-age of the search API responses, data can't change before the next sync.
+EVENTS_SEARCH_CACHE_MAX_AGE = env.int('EVENTS_SEARCH_CACHE_MAX_AGE', default=EXTERNAL_PROVIDER_SYNC_INTERVAL)
+# Seconds the rendered (and compressed) search responses are kept in the cache.
+EVENTS_SEARCH_RESPONSE_CACHE_TIMEOUT = env.int(
+    'EVENTS_SEARCH_RESPONSE_CACHE_TIMEOUT', default=EXTERNAL_PROVIDER_SYNC_INTERVAL
+)
+# Larger search responses, in bytes once compressed, are not cached (memcached refuses items over 1 MB by default).
+EVENTS_SEARCH_RESPONSE_CACHE_MAX_SIZE = env.int('EVENTS_SEARCH_RESPONSE_CACHE_MAX_SIZE', default=1000000)
+# Maximum number of windows of a batch search request.
+EVENTS_SEARCH_BATCH_MAX_WINDOWS = env.int('EVENTS_SEARCH_BATCH_MAX_WINDOWS', default=100)
+# Longest starts_at/ends_at window of a search, in days.
+EVENTS_SEARCH_MAX_WINDOW_DAYS = env.int('EVENTS_SEARCH_MAX_WINDOW_DAYS', default=366)
+# Searches matching more events than this are rejected.
+EVENTS_SEARCH_MAX_RESULTS = env.int('EVENTS_SEARCH_MAX_RESULTS', default=10000)
+# Requests of each client: average per second and maximum at once, over a sliding window of
+# burst / rate seconds (rate 0 disables it).
+EVENTS_SEARCH_THROTTLE_RATE = env.float('EVENTS_SEARCH_THROTTLE_RATE', default=10)
+EVENTS_SEARCH_THROTTLE_BURST = env.int('EVENTS_SEARCH_THROTTLE_BURST', default=50)
+# Searches querying the database at the same time across all the workers (0 for no limit).
+EVENTS_SEARCH_MAX_CONCURRENT_QUERIES = env.int('EVENTS_SEARCH_MAX_CONCURRENT_QUERIES', default=16)
+# Number of events fetched from the server-side cursor at a time by the export endpoint.
+EVENTS_EXPORT_CHUNK_SIZE = env.int('EVENTS_EXPORT_CHUNK_SIZE', default=2000)
+# Exports of each client, as EVENTS_SEARCH_THROTTLE_RATE/BURST (3 per 5 minutes by default),
+# and exports streamed at the same time across all the workers (0 for no limit).
+EVENTS_EXPORT_THROTTLE_RATE = env.float('EVENTS_EXPORT_THROTTLE_RATE', default=0.01)
+EVENTS_EXPORT_THROTTLE_BURST = env.int('EVENTS_EXPORT_THROTTLE_BURST', default=3)
+EVENTS_EXPORT_MAX_CONCURRENT = env.int('EVENTS_EXPORT_MAX_CONCURRENT', default=2)
+# Text search configuration used to build and query the title search vectors of the events.
+EVENTS_SEARCH_TEXT_CONFIG = env('EVENTS_SEARCH_TEXT_CONFIG', default='simple')
+# Search responses smaller than this number of bytes are not compressed (gzip, or brotli if installed).
+EVENTS_SEARCH_COMPRESSION_MIN_SIZE = env.int('EVENTS_SEARCH_COMPRESSION_MIN_SIZE', default=1024)
+
+# Maximum number of changes returned by a request to the change log.
+CHANGES_PAGE_SIZE = env.int('CHANGES_PAGE_SIZE', default=1000)
+
+# Ratio of the events search requests profiled (cProfile and SQL stats) to PROFILE_DIR, 0 disables it.
+EVENTS_SEARCH_PROFILE_SAMPLE_RATE = env.float('EVENTS_SEARCH_PROFILE_SAMPLE_RATE', default=0)
+# Directory of the profiles of the sampled requests and of the syncs run with --profile.
+PROFILE_DIR = env('PROFILE_DIR', default=os.path.join(tempfile.gettempdir(), 'fever-provider-profiles'))
+# Number of profiles kept in PROFILE_DIR, the oldest are removed.
+PROFILE_MAX_COUNT = env.int('PROFILE_MAX_COUNT', default=200)
+
+# Number of base events of the provider feed parsed and written to the database at a time.
+SYNC_CHUNK_SIZE = env.int('SYNC_CHUNK_SIZE', default=1000)
+
+# Number of processes parsing the provider feed, 0 or 1 to parse it in the sync process.
+SYNC_PARSE_WORKERS = env.int('SYNC_PARSE_WORKERS', default=0)
+
+# Seconds to wait for the provider to connect and send data, and size limits of its
+# payload: bytes kept in memory before spooling to disk, and maximum bytes accepted.
+SYNC_REQUEST_TIMEOUT = env.int('SYNC_REQUEST_TIMEOUT', default=60)
+SYNC_PAYLOAD_MEMORY_SIZE = env.int('SYNC_PAYLOAD_MEMORY_SIZE', default=16 * 1024 * 1024)
+SYNC_MAX_PAYLOAD_SIZE = env.int('SYNC_MAX_PAYLOAD_SIZE', default=1024 * 1024 * 1024)
+# Payloads with fewer base events than this ratio of the last applied one, or with more
+# elements missing required attributes than this ratio of their base events, are rejected.
+SYNC_MIN_EVENT_COUNT_RATIO = env.float('SYNC_MIN_EVENT_COUNT_RATIO', default=0.5)
+SYNC_MAX_INVALID_RATIO = env.float('SYNC_MAX_INVALID_RATIO', default=0.05)
+# Directory where the rejected payloads are saved with their metadata.
+SYNC_QUARANTINE_DIR = env('SYNC_QUARANTINE_DIR', default=os.path.join(tempfile.gettempdir(), 'fever-provider-quarantine'))
+# Directory where the payloads fetched by the syncs run with --record are saved with their metadata.
+SYNC_RECORD_DIR = env('SYNC_RECORD_DIR', default=os.path.join(tempfile.gettempdir(), 'fever-provider-payloads'))
+# Failed syncs in a row after which the provider isn't fetched for the cooldown, in seconds.
+SYNC_CIRCUIT_BREAKER_THRESHOLD = env.int('SYNC_CIRCUIT_BREAKER_THRESHOLD', default=3)
+SYNC_CIRCUIT_BREAKER_COOLDOWN = env.int('SYNC_CIRCUIT_BREAKER_COOLDOWN', default=900)
+
+# In-process index of upcoming events used by the search API instead of the ORM.
+EVENT_INDEX_ENABLED = env.bool('EVENT_INDEX_ENABLED', default=False)
+# Number of days ahead (from the moment the index is built) that the index covers.
+EVENT_INDEX_HORIZON_DAYS = env.int('EVENT_INDEX_HORIZON_DAYS', default=90)
+# Seconds after which the index is rebuilt even if no data version change was seen.
+EVENT_INDEX_MAX_AGE = env.int('EVENT_INDEX_MAX_AGE', default=3600)
+# Changed events above which the index is rebuilt rather than patched from the change log.
+EVENT_INDEX_MAX_PATCH_EVENTS = env.int('EVENT_INDEX_MAX_PATCH_EVENTS', default=1000)
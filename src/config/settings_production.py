@@ -0,0 +1,59 @@
+"""
+Django settings for serving the API in production.
+
+The API is public and stateless, so the admin, sessions, messages and CSRF
+machinery are left out of the request path. Use it with
+DJANGO_SETTINGS_MODULE=config.settings_production.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, env
+
+SECRET_KEY = env('DJANGO_SECRET_KEY')
+
+DEBUG = False
+
+ALLOWED_HOSTS = env.list('ALLOWED_HOSTS', default=['localhost'])
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    app for app in INSTALLED_APPS
+    if app not in ('django.contrib.admin', 'django.contrib.sessions', 'django.contrib.messages')
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    # Nothing else serves the static files under gunicorn (the Swagger UI needs them)
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [],
+    'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.AllowAny'],
+    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+    'UNAUTHENTICATED_USER': None,
+    # Number of proxies in front of gunicorn: the client address the throttles count is taken
+    # from X-Forwarded-For as set by the closest of them, 0 uses the address of the connection.
+    'NUM_PROXIES': env.int('NUM_PROXIES', default=0),
+}
+
+
+# Static files
+# Collected to STATIC_ROOT with collectstatic before gunicorn starts, compressed and with
+# hashed names so clients can cache them for good.
+
+STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+
+
+# Database
+# Connections are kept open between requests of the same worker.
+
+DATABASES['default']['CONN_MAX_AGE'] = env.int('POSTGRES_CONN_MAX_AGE', default=600)  # noqa: F405
+
+
+# Security
+
+SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+SECURE_CONTENT_TYPE_NOSNIFF = True
@@ -0,0 +1,20 @@
+"""
+Django settings for the short-lived sync_external_provider runs.
+
+The sync only needs the ORM, so the web apps (admin, DRF, Swagger, static files...)
+are not loaded, which keeps the startup of each run short. Use it with
+--settings=config.settings_sync.
+"""
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    'django.contrib.contenttypes',
+    'django.contrib.postgres',
+
+    # Internal Apps
+    'events_integration',
+]
+
+MIDDLEWARE = []
+
+ROOT_URLCONF = None
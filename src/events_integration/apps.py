@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class EventsIntegrationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'events_integration'
+
+    def ready(self):
+        # Registers the system checks
+        from . import checks  # noqa: F401
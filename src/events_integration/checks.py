@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# Backends whose add and incr are atomic across the processes sharing them
+ATOMIC_CACHE_BACKENDS = (
+    'django.core.cache.backends.memcached.PyMemcacheCache',
+    'django.core.cache.backends.memcached.PyLibMCCache',
+    'django.core.cache.backends.memcached.MemcachedCache',
+    'django_redis.cache.RedisCache',
+)
+
+
+@register()
+def check_throttling_cache(app_configs, **kwargs):
+    """
+    Warn when the events search throttle is enabled outside DEBUG with a cache whose
+    counters can lose concurrent increments.
+    """
+
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.DEBUG or not settings.EVENTS_SEARCH_THROTTLE_RATE or backend in ATOMIC_CACHE_BACKENDS:
+        return []
+
+    return [
+        Warning(
+            f"The cache backend {backend} doesn't increment atomically across processes, the "
+            "events search throttle can let through more requests than configured.",
+            hint="Set MEMCACHED_LOCATION to use memcached.",
+            id='events_integration.W001',
+        )
+    ]
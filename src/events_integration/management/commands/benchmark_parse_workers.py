@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.management import BaseCommand, CommandError
+
+from events_integration.rest.utils.sync_external_events import SyncExternalEvents
+from events_integration.rest.utils.synthetic_feed import SyntheticFeed
+
+
+class Command(BaseCommand):
+    help = (
+        "Times the parse stage of the sync (apply_payload, with the database writes left out) on a "
+        "synthetic feed for each number of parse workers, to measure how it scales"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=200000, help="Number of base events of the feed")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Number of base events per chunk")
+        parser.add_argument(
+            "--workers", default="1,2,4,8",
+            help="Comma-separated numbers of parse workers, 1 parses the feed in this process",
+        )
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per number of workers, the best is kept")
+
+    def handle(self, *args, **options):
+        try:
+            worker_counts = [int(workers) for workers in options["workers"].split(",")]
+        except ValueError:
+            raise CommandError("--workers must be comma-separated numbers")
+
+        # The same feed for every run, written once
+        with tempfile.NamedTemporaryFile(suffix=".xml") as feed_file:
+            shutil.copyfileobj(SyntheticFeed(options["events"]), feed_file)
+            feed_file.flush()
+            self.stdout.write(
+                f"{options['events']} base events ({os.path.getsize(feed_file.name) / 1e6:.1f} MB), "
+                f"chunks of {options['chunk_size']}, {os.cpu_count()} CPUs"
+            )
+
+            baseline = None
+            for workers in worker_counts:
+                duration = min(
+                    self.time_parse(feed_file.name, workers, options["chunk_size"], options["events"])
+                    for _ in range(options["repeat"])
+                )
+                baseline = baseline or duration
+                self.stdout.write(
+                    f"{workers} workers: {duration:.2f}s, {options['events'] / duration:.0f} events/s, "
+                    f"speedup {baseline / duration:.2f}x"
+                )
+
+    @staticmethod
+    def time_parse(path, workers, chunk_size, event_count):
+        row_counts = [0]
+
+        def write_rows(event_rows, zone_rows):
+            row_counts[0] += len(event_rows)
+
+        sync = SyncExternalEvents(path, chunk_size=chunk_size, workers=workers, provider="benchmark")
+        sync.write_rows = write_rows
+        with open(path, "rb") as sync.payload:
+            started_at = time.perf_counter()
+            sync.apply_payload()
+            duration = time.perf_counter() - started_at
+
+        if row_counts[0] != event_count:
+            raise CommandError(f"{row_counts[0]} events parsed with {workers} workers, {event_count} expected")
+
+        return duration
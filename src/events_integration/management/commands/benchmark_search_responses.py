@@ -0,0 +1,67 @@
+import time
+
+from django.core.cache import cache
+from django.core.management import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from events_integration.rest.utils.compression import brotli
+
+
+class Command(BaseCommand):
+    help = (
+        "Requests an events search in process for each content encoding (identity, gzip, and br if "
+        "brotli is installed) and reports the bytes sent and the CPU time per request, with the "
+        "rendered response served from the cache (hit) or not (miss)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path", help="Path of the search with its query string, e.g. /api/events/search/?starts_at=...",
+        )
+        parser.add_argument("--requests", type=int, default=50, help="Requests per encoding and cache state")
+
+    def handle(self, *args, **options):
+        encodings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+        if brotli is None:
+            self.stdout.write("brotli isn't installed, br is not measured")
+
+        client = Client(HTTP_HOST="localhost")
+        self.stdout.write(f"{'encoding':<10}{'cache':<7}{'bytes':>12}{'CPU ms':>10}{'wall ms':>10}")
+        # All the requests come from this process
+        with override_settings(EVENTS_SEARCH_THROTTLE_RATE=0):
+            for encoding in encodings:
+                response = client.get(options["path"], HTTP_ACCEPT_ENCODING=encoding)
+                if response.status_code != 200:
+                    raise CommandError(f"The search returned {response.status_code}: {response.content[:200]!r}")
+                # As EventsView.list keys the rendered responses
+                cache_key = f"events_search:{response['ETag']}:{None if encoding == 'identity' else encoding}"
+
+                for cache_state in ("miss", "hit"):
+                    size, cpu_time, wall_time = self.measure(
+                        client, options["path"], encoding, options["requests"],
+                        cache_key if cache_state == "miss" else None,
+                    )
+                    self.stdout.write(
+                        f"{encoding:<10}{cache_state:<7}{size:>12}{cpu_time * 1000:>10.2f}{wall_time * 1000:>10.2f}"
+                    )
+
+    @staticmethod
+    def measure(client, path, encoding, request_count, evicted_cache_key):
+        """
+        Send the same request several times.
+
+        Returns:
+            tuple: The size of the response body in bytes, and the CPU and wall times per request
+                in seconds.
+        """
+
+        cpu_time = wall_time = 0
+        for _ in range(request_count):
+            if evicted_cache_key:
+                cache.delete(evicted_cache_key)
+            started_at, cpu_started_at = time.perf_counter(), time.process_time()
+            response = client.get(path, HTTP_ACCEPT_ENCODING=encoding)
+            cpu_time += time.process_time() - cpu_started_at
+            wall_time += time.perf_counter() - started_at
+
+        return len(response.content), cpu_time / request_count, wall_time / request_count
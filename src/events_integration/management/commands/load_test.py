@@ -0,0 +1,61 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Sends GET requests to a URL of the API from concurrent clients and reports the throughput "
+        "and the latencies, e.g. to compare serving setups (disable the throttle of the server with "
+        "EVENTS_SEARCH_THROTTLE_RATE=0, all the requests come from the same address)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", help="URL requested, with its query string")
+        parser.add_argument("--requests", type=int, default=1000, help="Number of requests sent")
+        parser.add_argument("--concurrency", type=int, default=10, help="Number of clients sending them")
+        parser.add_argument("--timeout", type=float, default=30, help="Seconds to wait for each response")
+
+    def handle(self, *args, **options):
+        # Imported here as in the sync, only needed by this command
+        import requests
+
+        url = options["url"]
+        timeout = options["timeout"]
+        sessions = threading.local()
+
+        def send(_):
+            if not hasattr(sessions, "session"):
+                # One keep-alive connection per client
+                sessions.session = requests.Session()
+            started_at = time.perf_counter()
+            try:
+                status = sessions.session.get(url, timeout=timeout).status_code
+            except requests.exceptions.RequestException as e:
+                status = type(e).__name__
+            return status, time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            results = list(executor.map(send, range(options["requests"])))
+        duration = time.perf_counter() - started_at
+
+        if not results:
+            raise CommandError("No request sent.")
+
+        statuses = Counter(status for status, _ in results)
+        latencies = sorted(latency for _, latency in results)
+
+        def percentile(ratio):
+            return latencies[min(len(latencies) - 1, int(ratio * len(latencies)))] * 1000
+
+        self.stdout.write(
+            f"{len(results)} requests from {options['concurrency']} clients in {duration:.2f}s: "
+            f"{len(results) / duration:.1f} requests/s\n"
+            f"Latency (ms): p50 {percentile(0.5):.1f}, p95 {percentile(0.95):.1f}, "
+            f"p99 {percentile(0.99):.1f}, max {latencies[-1] * 1000:.1f}\n"
+            f"Responses: {', '.join(f'{status}: {count}' for status, count in sorted(statuses.items(), key=str))}"
+        )
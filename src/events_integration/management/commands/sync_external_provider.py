@@ -1,11 +1,83 @@
-from django.core.management import BaseCommand
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
 
-from events_integration.rest.utils.sync_external_events import SyncExternalEvents
+from events_integration.rest.utils.payload_store import get_payload_paths
+from events_integration.rest.utils.profiling import profile
+from events_integration.rest.utils.sync_external_events import ReplaySyncExternalEvents, SyncExternalEvents
 
 
 class Command(BaseCommand):
     help = "Syncs events from external provider"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", type=int, default=None,
+            help="Number of base events parsed and written at a time (SYNC_CHUNK_SIZE by default)",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=None,
+            help="Number of processes parsing the feed, 0 or 1 to parse it in this process "
+                 "(SYNC_PARSE_WORKERS by default)",
+        )
+        parser.add_argument(
+            "--record", action="store_true",
+            help="Save the fetched payload with its metadata to SYNC_RECORD_DIR",
+        )
+        parser.add_argument(
+            "--profile", action="store_true",
+            help="Profile the sync with cProfile and count its SQL queries, saved to PROFILE_DIR "
+                 "(the parse workers of --workers are not profiled)",
+        )
+        source = parser.add_mutually_exclusive_group()
+        source.add_argument(
+            "--from-file", default=None,
+            help="Sync from a recorded (or quarantined) payload instead of the provider",
+        )
+        source.add_argument(
+            "--from-dir", default=None,
+            help="Sync from all the payloads of a directory, oldest first, instead of the provider",
+        )
+
     def handle(self, *args, **options):
+        if not options["profile"]:
+            return self.sync(options)
+
+        # Saved even if the sync fails
+        with profile("sync_external_provider", settings.PROFILE_DIR, max_count=settings.PROFILE_MAX_COUNT) as stats:
+            self.sync(options)
+
+        self.stdout.write(
+            f"Sync done in {stats.total_duration:.3f}s, {stats.count} SQL queries in "
+            f"{stats.duration:.3f}s, profile saved to {stats.profile_path}"
+        )
+
+    def sync(self, options):
+        chunk_size = options["chunk_size"]
+        workers = options["workers"]
+
+        if options["from_file"] or options["from_dir"]:
+            if options["from_file"]:
+                payload_paths = [options["from_file"]]
+            else:
+                payload_paths = get_payload_paths(options["from_dir"])
+                if not payload_paths:
+                    raise CommandError(f"No payloads in {options['from_dir']}")
+
+            failed_count = 0
+            for payload_path in payload_paths:
+                self.stdout.write(f"Replaying {payload_path}")
+                try:
+                    ReplaySyncExternalEvents(payload_path, chunk_size=chunk_size, workers=workers).start()
+                except (OSError, RuntimeError) as e:
+                    # Keep replaying the rest of the directory, unreadable payloads included
+                    failed_count += 1
+                    self.stderr.write(f"Replay of {payload_path} failed: {e}")
+
+            if failed_count:
+                raise CommandError(f"{failed_count} of {len(payload_paths)} payloads failed")
+            return
+
         url = "https://provider.code-challenge.feverup.com/api/events"
-        SyncExternalEvents(api_path=url).start()
+        SyncExternalEvents(
+            api_path=url, chunk_size=chunk_size, workers=workers, record=options["record"]
+        ).start()
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.12 on 2026-10-19 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events_integration', '0005_alter_event_event_end_datetime'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='event_end_datetime',
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='event_start_datetime',
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('sold_out', False)), fields=['event_start_datetime', 'event_end_datetime'], name='event_available_window_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='zone',
+            index=models.Index(fields=['event', 'price'], name='zone_event_price_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.12 on 2026-10-19 14:10
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def update_search_vectors(apps, schema_editor):
+    Event = apps.get_model('events_integration', 'Event')
+    Event.objects.using(schema_editor.connection.alias).update(
+        search_vector=SearchVector('title', config=settings.EVENTS_SEARCH_TEXT_CONFIG)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events_integration', '0006_search_filters_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='event_search_vector_idx'),
+        ),
+        migrations.RunPython(update_search_vectors, migrations.RunPython.noop),
+    ]
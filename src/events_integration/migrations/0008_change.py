@@ -0,0 +1,26 @@
+# Generated by Django 3.2.12 on 2026-10-19 14:19
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events_integration', '0007_event_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('entity', models.CharField(choices=[('event', 'Event'), ('zone', 'Zone')], max_length=16)),
+                ('entity_id', models.IntegerField()),
+                ('event_uuid', models.UUIDField(null=True)),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('removed', 'Removed')], max_length=16)),
+                ('changes', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('creation_datetime', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.12 on 2026-10-19 14:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events_integration', '0008_change'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProviderSyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('creation_datetime', models.DateTimeField(auto_now_add=True)),
+                ('modification_datetime', models.DateTimeField(auto_now=True)),
+                ('provider', models.CharField(max_length=255, unique=True)),
+                ('consecutive_failures', models.IntegerField(default=0)),
+                ('opened_until', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('last_event_count', models.IntegerField(blank=True, null=True)),
+                ('last_success_datetime', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -1,2 +1,4 @@
+from .change import Change
 from .event import Event
+from .provider_sync_state import ProviderSyncState
 from .zone import Zone
@@ -0,0 +1,30 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class Change(models.Model):
+    """
+    Append-only log of the changes of the events and zones written by the sync with the
+    external provider. The id is the sequence consumers use as cursor.
+    """
+
+    ENTITY_EVENT = 'event'
+    ENTITY_ZONE = 'zone'
+    ENTITY_CHOICES = [(ENTITY_EVENT, 'Event'), (ENTITY_ZONE, 'Zone')]
+
+    ACTION_CREATED = 'created'
+    ACTION_UPDATED = 'updated'
+    ACTION_REMOVED = 'removed'
+    ACTION_CHOICES = [(ACTION_CREATED, 'Created'), (ACTION_UPDATED, 'Updated'), (ACTION_REMOVED, 'Removed')]
+
+    id = models.BigAutoField(primary_key=True)
+
+    entity = models.CharField(null=False, blank=False, max_length=16, choices=ENTITY_CHOICES)
+    entity_id = models.IntegerField(null=False, blank=False)
+    # Public id of the event, or of the event of the zone
+    event_uuid = models.UUIDField(null=True, blank=False)
+    action = models.CharField(null=False, blank=False, max_length=16, choices=ACTION_CHOICES)
+    # Changed fields as {field: [old value, new value]}
+    changes = models.JSONField(null=False, blank=False, default=dict, encoder=DjangoJSONEncoder)
+
+    creation_datetime = models.DateTimeField(auto_now_add=True, null=False, blank=False)
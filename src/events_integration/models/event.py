@@ -1,5 +1,7 @@
 import uuid
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 from .abstract_models import TimeAuditedModel
@@ -28,3 +30,15 @@ class Event(BaseEvent):
 
     sold_out = models.BooleanField(null=False, blank=False)
 
+    # Full-text search vector of the title, maintained by the sync with the external provider
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='event_search_vector_idx'),
+            # Searches of the events still on sale in a window
+            models.Index(
+                fields=['event_start_datetime', 'event_end_datetime'], condition=models.Q(sold_out=False),
+                name='event_available_window_idx'
+            ),
+        ]
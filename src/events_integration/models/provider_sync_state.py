@@ -0,0 +1,20 @@
+from django.db import models
+
+from .abstract_models import TimeAuditedModel
+
+
+class ProviderSyncState(TimeAuditedModel):
+    """
+    Circuit breaker state and last accepted payload of the sync with an external provider.
+    """
+
+    provider = models.CharField(null=False, blank=False, max_length=255, unique=True)
+
+    # Failed syncs in a row, fetches are skipped until opened_until once the threshold is reached
+    consecutive_failures = models.IntegerField(null=False, blank=False, default=0)
+    opened_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(null=False, blank=True, default='')
+
+    # Number of base events of the last applied payload, to detect truncated ones
+    last_event_count = models.IntegerField(null=True, blank=True)
+    last_success_datetime = models.DateTimeField(null=True, blank=True)
@@ -13,3 +13,9 @@ class Zone(TimeAuditedModel):
     capacity = models.IntegerField(blank=False, null=False)
     price = models.FloatField(blank=False, null=False)
     numbered = models.BooleanField(default=True)
+
+    class Meta:
+        indexes = [
+            # Price filters of the events search, checked for each event of the window
+            models.Index(fields=['event', 'price'], name='zone_event_price_idx'),
+        ]
@@ -0,0 +1,22 @@
+from rest_framework import serializers
+
+from events_integration.models import Change
+
+
+class ChangeSerializer(serializers.ModelSerializer):
+    # Cursor of the change, to pass as since to get the following ones
+    sequence = serializers.IntegerField(source='id', read_only=True)
+    # Public ids, as returned by the events and zones searches
+    event = serializers.UUIDField(source='event_uuid', read_only=True)
+    zone = serializers.SerializerMethodField()
+
+    def get_zone(self, obj):
+        if obj.entity == Change.ENTITY_ZONE:
+            return obj.entity_id
+        return None
+
+    class Meta:
+        model = Change
+        fields = [
+            'sequence', 'entity', 'action', 'event', 'zone', 'changes', 'creation_datetime'
+        ]
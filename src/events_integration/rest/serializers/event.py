@@ -2,6 +2,7 @@ from django.db.models import Max, Min
 from rest_framework import serializers
 
 from events_integration.models import Event
+from .zone import ZoneSerializer
 
 
 class EventSerializer(serializers.ModelSerializer):
@@ -29,9 +30,14 @@ class EventSerializer(serializers.ModelSerializer):
         return obj.event_end_datetime.time().isoformat()
 
     def get_min_price(self, obj):
+        # Precomputed by the search queryset annotations or by the event index
+        if hasattr(obj, 'min_price'):
+            return obj.min_price
         return obj.zones.aggregate(min_price=Min('price'))['min_price']
 
     def get_max_price(self, obj):
+        if hasattr(obj, 'max_price'):
+            return obj.max_price
         return obj.zones.aggregate(max_price=Max('price'))['max_price']
 
     class Meta:
@@ -40,3 +46,10 @@ class EventSerializer(serializers.ModelSerializer):
             'id', 'title', 'start_date', 'start_time',
             'end_date', 'end_time', 'min_price', 'max_price'
         ]
+
+
+class EventWithZonesSerializer(EventSerializer):
+    zones = ZoneSerializer(many=True, read_only=True)
+
+    class Meta(EventSerializer.Meta):
+        fields = EventSerializer.Meta.fields + ['zones']
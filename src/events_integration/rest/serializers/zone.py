@@ -4,6 +4,8 @@ from events_integration.models import Zone
 
 
 class ZoneSerializer(serializers.ModelSerializer):
+    # Public id of the event, as returned by the events search
+    event = serializers.UUIDField(source='event.uuid', read_only=True)
 
     class Meta:
         model = Zone
@@ -0,0 +1,66 @@
+import datetime
+import logging
+
+from django.conf import settings
+from django.utils import timezone
+
+from events_integration.models import ProviderSyncState
+
+logger = logging.getLogger("sync_external_events")
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of the syncs with an external provider, kept in the database so it is
+    shared by all the sync runs.
+
+    After SYNC_CIRCUIT_BREAKER_THRESHOLD failed syncs in a row the circuit opens and the
+    provider isn't fetched for SYNC_CIRCUIT_BREAKER_COOLDOWN seconds. The first sync after
+    the cooldown is a trial: a new failure opens the circuit again, a success closes it.
+    """
+
+    def __init__(self, provider):
+        """
+        Args:
+            provider (str): The name of the provider.
+        """
+
+        self.state, _ = ProviderSyncState.objects.get_or_create(provider=provider)
+
+    def is_open(self):
+        opened_until = self.state.opened_until
+        return opened_until is not None and timezone.now() < opened_until
+
+    def record_success(self, event_count):
+        """
+        Close the circuit after an applied payload.
+
+        Args:
+            event_count (int): The number of base events of the payload.
+        """
+
+        self.state.consecutive_failures = 0
+        self.state.opened_until = None
+        self.state.last_error = ""
+        self.state.last_event_count = event_count
+        self.state.last_success_datetime = timezone.now()
+        self.state.save()
+
+    def record_failure(self, error):
+        """
+        Count a failed sync, opening the circuit if the threshold is reached.
+
+        Args:
+            error (Exception): The reason of the failure.
+        """
+
+        self.state.consecutive_failures += 1
+        self.state.last_error = str(error)
+        if self.state.consecutive_failures >= settings.SYNC_CIRCUIT_BREAKER_THRESHOLD:
+            cooldown = datetime.timedelta(seconds=settings.SYNC_CIRCUIT_BREAKER_COOLDOWN)
+            self.state.opened_until = timezone.now() + cooldown
+            logger.error(
+                "Circuit of %s opened until %s after %s failures: %s", self.state.provider,
+                self.state.opened_until, self.state.consecutive_failures, error,
+            )
+        self.state.save()
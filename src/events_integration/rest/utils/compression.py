@@ -0,0 +1,74 @@
+import gzip
+
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    # Optional dependency, responses are gzipped when it is not installed
+    brotli = None
+
+GZIP_COMPRESS_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def get_accepted_encoding(request):
+    """
+    Pick the content encoding to use for the response of a request.
+
+    Args:
+        request: The HTTP request.
+
+    Returns:
+        str: "br" or "gzip", or None if the client doesn't accept a supported encoding.
+    """
+
+    accepted_encodings = set()
+    for value in request.META.get("HTTP_ACCEPT_ENCODING", "").split(","):
+        encoding, _, params = value.strip().partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q=") and params[2:] in ("0", "0.0", "0.00", "0.000"):
+            continue
+        accepted_encodings.add(encoding.strip().lower())
+
+    if brotli is not None and "br" in accepted_encodings:
+        return "br"
+    if "gzip" in accepted_encodings:
+        return "gzip"
+
+    return None
+
+
+def compress(content, encoding):
+    """
+    Compress the content of a response.
+
+    Args:
+        content (bytes): The content to compress.
+        encoding (str): "br" or "gzip".
+
+    Returns:
+        bytes: The compressed content.
+    """
+
+    if encoding == "br":
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+
+    return gzip.compress(content, compresslevel=GZIP_COMPRESS_LEVEL, mtime=0)
+
+
+def set_response_content(response, content, encoding):
+    """
+    Replace the content of a response by its (maybe) compressed version.
+
+    Args:
+        response: The HTTP response.
+        content (bytes): The new content.
+        encoding (str): The encoding of the content, None if it is not compressed.
+    """
+
+    response.content = content
+    response["Content-Length"] = str(len(content))
+    if encoding:
+        response["Content-Encoding"] = encoding
+    patch_vary_headers(response, ("Accept-Encoding",))
@@ -0,0 +1,65 @@
+from django.core.cache import cache
+
+from events_integration.models import Change
+
+DATA_VERSION_CACHE_KEY = "events_integration:data_version_state"
+
+
+def load_data_version_state():
+    """
+    Read the version of the events data from the change log: the id of the last change
+    and when it was written.
+
+    Returns:
+        tuple: The data version (str, "0" if no change has been logged yet) and its
+            datetime (None if no change has been logged yet).
+    """
+
+    last_change = Change.objects.order_by('-id').values_list('id', 'creation_datetime').first()
+    if last_change is None:
+        return "0", None
+
+    return str(last_change[0]), last_change[1]
+
+
+def get_data_version_state():
+    """
+    Get the version of the events data and its datetime, from the cache, or from the change
+    log when it isn't cached (never recorded, or evicted).
+
+    Returns:
+        tuple: The data version (str) and its datetime (or None).
+    """
+
+    state = cache.get(DATA_VERSION_CACHE_KEY)
+    if state is None:
+        state = load_data_version_state()
+        # Not overwriting the state set by a sync that finished since it was read
+        cache.add(DATA_VERSION_CACHE_KEY, state, timeout=None)
+
+    return state
+
+
+def get_data_version():
+    """
+    Get the current version of the events data.
+
+    Returns:
+        str: The data version, "0" if no change has been logged yet.
+    """
+
+    return get_data_version_state()[0]
+
+
+def bump_data_version():
+    """
+    Record that the events data changed, as of the last logged change.
+
+    Returns:
+        str: The new data version.
+    """
+
+    state = load_data_version_state()
+    cache.set(DATA_VERSION_CACHE_KEY, state, timeout=None)
+
+    return state[0]
@@ -0,0 +1,168 @@
+import datetime
+import logging
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+from django.conf import settings
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from events_integration.models import Change, Event
+from .data_version import get_data_version
+
+logger = logging.getLogger("sync_external_events")
+
+
+class IndexedEvent:
+    """
+    Compact, read-only record of an event held by the EventIndex.
+    It exposes the same attributes EventSerializer reads from an Event.
+    """
+
+    __slots__ = (
+        "id", "uuid", "title", "event_start_datetime", "event_end_datetime",
+        "modification_datetime", "min_price", "max_price",
+    )
+
+    def __init__(self, id, uuid, title, event_start_datetime, event_end_datetime,
+                 modification_datetime, min_price, max_price):
+        self.id = id
+        self.uuid = uuid
+        self.title = title
+        self.event_start_datetime = event_start_datetime
+        self.event_end_datetime = event_end_datetime
+        self.modification_datetime = modification_datetime
+        self.min_price = min_price
+        self.max_price = max_price
+
+
+class EventIndex:
+    """
+    In-process index of the upcoming events sorted by start datetime.
+
+    It answers the search windows covered by it with a binary search. When the data version
+    changes, the events changed since the version of the index are reloaded, read from the
+    change log shared by all the workers; it is rebuilt when they are too many or when it
+    gets older than EVENT_INDEX_MAX_AGE.
+    """
+
+    fields = IndexedEvent.__slots__
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Covered window, start timestamps and records, replaced together so readers never
+        # see them mismatched.
+        self._data = (None, None, array("d"), [])
+        self.version = None
+        self.built_at = None
+
+    def _get_queryset(self):
+        return Event.objects.annotate(
+            min_price=Min("zones__price"), max_price=Max("zones__price")
+        ).values_list(*self.fields)
+
+    def _set_records(self, covered_from, covered_until, records):
+        records.sort(key=lambda record: record.event_start_datetime)
+        starts = array("d", (record.event_start_datetime.timestamp() for record in records))
+        self._data = (covered_from, covered_until, starts, records)
+
+    def rebuild(self):
+        """
+        Load the events starting within the index horizon from the database.
+        """
+
+        version = get_data_version()
+        covered_from = timezone.now()
+        covered_until = covered_from + datetime.timedelta(days=settings.EVENT_INDEX_HORIZON_DAYS)
+
+        queryset = self._get_queryset().filter(
+            event_start_datetime__gte=covered_from, event_start_datetime__lte=covered_until
+        )
+        records = [IndexedEvent(*row) for row in queryset]
+        self._set_records(covered_from, covered_until, records)
+
+        self.version = version
+        self.built_at = time.monotonic()
+        logger.info("Event index rebuilt with %s events (version %s)", len(records), version)
+
+    def patch(self, version):
+        """
+        Reload the events changed between the version of the index and the given one, from the
+        change log, keeping the rest of the index.
+
+        Args:
+            version (str): The current data version.
+
+        Returns:
+            bool: Whether the index was patched, False if it has to be rebuilt instead.
+        """
+
+        if int(version) < int(self.version):
+            # The change log was reset
+            return False
+
+        max_events = settings.EVENT_INDEX_MAX_PATCH_EVENTS
+        event_uuids = set(
+            Change.objects.filter(id__gt=int(self.version), id__lte=int(version))
+            .values_list("event_uuid", flat=True).distinct()[:max_events + 1]
+        )
+        if len(event_uuids) > max_events or None in event_uuids:
+            return False
+
+        covered_from, covered_until, _, records = self._data
+        queryset = self._get_queryset().filter(
+            uuid__in=event_uuids,
+            event_start_datetime__gte=covered_from,
+            event_start_datetime__lte=covered_until,
+        )
+        records = [record for record in records if record.uuid not in event_uuids]
+        records.extend(IndexedEvent(*row) for row in queryset)
+        self._set_records(covered_from, covered_until, records)
+
+        self.version = version
+        logger.info("Event index patched with %s changed events (version %s)", len(event_uuids), version)
+        return True
+
+    def is_expired(self):
+        return self.version is None or time.monotonic() - self.built_at > settings.EVENT_INDEX_MAX_AGE
+
+    def is_stale(self):
+        return self.is_expired() or self.version != get_data_version()
+
+    def refresh(self):
+        """
+        Patch the index if the data changed since it was built, rebuild it if it expired or
+        the changes are too many.
+        """
+
+        if self.is_stale():
+            with self._lock:
+                if self.is_stale() and (self.is_expired() or not self.patch(get_data_version())):
+                    self.rebuild()
+
+    def search(self, starts_at, ends_at):
+        """
+        Get the events starting after starts_at and ending before ends_at.
+
+        Args:
+            starts_at (datetime): The aware start of the window.
+            ends_at (datetime): The aware end of the window.
+
+        Returns:
+            list: The IndexedEvent records sorted by start datetime,
+                or None if the window is not fully covered by the index.
+        """
+
+        covered_from, covered_until, starts, records = self._data
+        if covered_from is None or starts_at < covered_from or ends_at > covered_until:
+            return None
+
+        low = bisect_left(starts, starts_at.timestamp())
+        high = bisect_right(starts, ends_at.timestamp())
+
+        return [record for record in records[low:high] if record.event_end_datetime <= ends_at]
+
+
+event_index = EventIndex()
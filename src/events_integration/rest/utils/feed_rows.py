@@ -0,0 +1,219 @@
+"""
+Transformation of the provider feed into compact row tuples.
+
+Nothing in this module depends on Django, so its functions can run in the worker
+processes of the parallel parse mode of the sync, whatever their start method.
+"""
+
+import datetime
+
+import xmltodict
+
+EVENT_FIELDS = (
+    "id", "base_event_id", "organizer_company_id", "title", "sell_mode",
+    "event_start_datetime", "event_end_datetime", "sell_from", "sell_to", "sold_out",
+)
+ZONE_FIELDS = ("id", "event_id", "capacity", "price", "name", "numbered")
+
+BASE_EVENT_START_TAG = b"<base_event"
+BASE_EVENT_END_TAG = b"</base_event>"
+
+
+def parse_date(datetime_str, datetime_parser_mask="%Y-%m-%dT%H:%M:%S"):
+    """
+    Parse datetime string into datetime object.
+
+    Args:
+        datetime_str (str): The datetime string to parse.
+        datetime_parser_mask (str): The format mask for parsing the datetime string.
+
+    Returns:
+        datetime: The parsed datetime object.
+    """
+
+    return datetime.datetime.strptime(datetime_str, datetime_parser_mask)
+
+
+def add_zone_row(zone, event_id, zone_rows):
+    """
+    Add the row of a zone, as ZONE_FIELDS, to the zone rows. Invalid zones, and the ones
+    already added, are skipped.
+
+    Args:
+        zone: The zone data to add.
+        event_id (int): The ID of the event associated with the zone.
+        zone_rows (dict): The zone rows by zone ID.
+    """
+
+    try:
+        zone_id = int(zone["@zone_id"])
+        if zone_id in zone_rows:
+            return
+        zone_rows[zone_id] = (
+            zone_id,
+            event_id,
+            int(zone["@capacity"]),
+            float(zone["@price"]),
+            zone["@name"],
+            zone["@numbered"] == "true",
+        )
+    except (KeyError, TypeError, ValueError):
+        # Invalid data
+        pass
+
+
+def add_zone_rows(event_zones, event_id, zone_rows):
+    """
+    Add the rows of the zones of an event to the zone rows.
+
+    Args:
+        event_zones: The zone data for an event, a list or a single zone.
+        event_id (int): The ID of the event.
+        zone_rows (dict): The zone rows by zone ID.
+    """
+
+    if isinstance(event_zones, list):
+        for zone in event_zones:
+            add_zone_row(zone, event_id, zone_rows)
+    else:
+        add_zone_row(event_zones, event_id, zone_rows)
+
+
+def add_event_row(base_event, event, event_rows):
+    """
+    Add the row of an event, as EVENT_FIELDS, to the event rows. Invalid events, and the ones
+    already added, are skipped.
+
+    Args:
+        base_event: The base event data.
+        event: The event data.
+        event_rows (dict): The event rows by event ID.
+
+    Returns:
+        int: The ID of the event, None if it is invalid or a duplicate.
+    """
+
+    try:
+        event_id = int(event["@event_id"])
+        if event_id in event_rows:
+            return None
+        organizer_company_id = base_event.get("@organizer_company_id", None)
+        event_rows[event_id] = (
+            event_id,
+            int(base_event["@base_event_id"]),
+            int(organizer_company_id) if organizer_company_id is not None else None,
+            base_event["@title"],
+            base_event["@sell_mode"],
+            parse_date(event["@event_start_date"]),
+            parse_date(event["@event_end_date"]),
+            parse_date(event["@sell_from"]),
+            parse_date(event["@sell_to"]),
+            event["@sold_out"] == "true",
+        )
+    except (KeyError, TypeError, ValueError):
+        # Invalid data
+        return None
+
+    return event_id
+
+
+def get_event_and_zone_rows(base_events):
+    """
+    Extract the rows of the online events and of their zones from base events.
+
+    Invalid elements are skipped, and so are the zones of invalid events, so the rows can
+    always be written. The first occurrence of a duplicated id is kept.
+
+    Args:
+        base_events (List): The base events data.
+
+    Returns:
+        tuple: The event rows and the zone rows, as dictionaries by ID.
+    """
+
+    event_rows = dict()
+    zone_rows = dict()
+
+    for base_event in base_events:
+        if not isinstance(base_event, dict) or base_event.get("@sell_mode") != "online":
+            continue
+
+        events = base_event.get("event", None)
+        for event in events if isinstance(events, list) else [events]:
+            if not isinstance(event, dict):
+                continue
+
+            event_id = add_event_row(base_event, event, event_rows)
+            if event_id is not None:
+                add_zone_rows(event.get("zone", []), event_id, zone_rows)
+
+    return event_rows, zone_rows
+
+
+def iter_base_event_chunks(stream, chunk_size, read_size=1 << 20):
+    """
+    Split a feed into byte ranges of whole base_event elements, without parsing it.
+
+    Args:
+        stream: The binary file-like object of the feed.
+        chunk_size (int): The number of base events per range.
+        read_size (int): The number of bytes read from the stream at a time.
+
+    Yields:
+        bytes: The XML of up to chunk_size consecutive base_event elements.
+    """
+
+    buffer = bytearray()
+    started = False
+    # End of the last base_event found, number of base events before it, and position from
+    # which the next end tag is looked for
+    chunk_end = 0
+    count = 0
+    position = 0
+
+    for block in iter(lambda: stream.read(read_size), b""):
+        buffer += block
+
+        if not started:
+            start = buffer.find(BASE_EVENT_START_TAG)
+            if start < 0:
+                continue
+            # Drop the XML declaration and the eventList and output opening tags
+            del buffer[:start]
+            started = True
+
+        while True:
+            end = buffer.find(BASE_EVENT_END_TAG, position)
+            if end < 0:
+                # An end tag may be split between this block and the next one
+                position = max(position, len(buffer) - len(BASE_EVENT_END_TAG) + 1)
+                break
+
+            chunk_end = position = end + len(BASE_EVENT_END_TAG)
+            count += 1
+            if count == chunk_size:
+                yield bytes(buffer[:chunk_end])
+                del buffer[:chunk_end]
+                chunk_end = count = position = 0
+
+    if count:
+        # The rest of the buffer holds the output and eventList closing tags
+        yield bytes(buffer[:chunk_end])
+
+
+def parse_feed_chunk(content):
+    """
+    Parse a byte range of base_event elements into event and zone rows.
+
+    Args:
+        content (bytes): The XML of the base events, as yielded by iter_base_event_chunks.
+
+    Returns:
+        tuple: The event rows and the zone rows, as dictionaries by ID.
+    """
+
+    base_events = xmltodict.parse(b"<output>" + content + b"</output>")["output"]["base_event"]
+    if not isinstance(base_events, list):
+        base_events = [base_events]
+
+    return get_event_and_zone_rows(base_events)
@@ -0,0 +1,67 @@
+"""
+Sanity checks of a provider feed, run on the whole payload before anything is written.
+
+Nothing in this module depends on Django, it only reads the feed.
+"""
+
+from xml.etree import ElementTree
+
+# Attributes without which an element of the feed can't be stored
+REQUIRED_ATTRIBUTES = {
+    "base_event": ("base_event_id", "sell_mode", "title"),
+    "event": ("event_id", "event_start_date", "event_end_date", "sell_from", "sell_to", "sold_out"),
+    "zone": ("zone_id", "capacity", "price", "name", "numbered"),
+}
+
+
+class InvalidFeed(ValueError):
+    pass
+
+
+def inspect_feed(payload):
+    """
+    Check that a feed is well-formed and count its base events, with a single streamed
+    pass so its size doesn't matter.
+
+    Args:
+        payload: The binary file-like object of the feed.
+
+    Returns:
+        tuple: The number of base events, and the number of elements missing a required
+            attribute.
+
+    Raises:
+        InvalidFeed: If the feed is not well-formed XML (e.g. truncated) or it is not an
+            eventList > output document.
+    """
+
+    event_count = 0
+    invalid_count = 0
+    depth = 0
+    output = None
+
+    try:
+        for action, element in ElementTree.iterparse(payload, events=("start", "end")):
+            if action == "start":
+                if depth == 0 and element.tag != "eventList":
+                    raise InvalidFeed(f"Unexpected root element '{element.tag}'.")
+                if depth == 1:
+                    if element.tag != "output":
+                        raise InvalidFeed(f"Unexpected element '{element.tag}' in eventList.")
+                    output = element
+                depth += 1
+                continue
+
+            depth -= 1
+            required_attributes = REQUIRED_ATTRIBUTES.get(element.tag, ())
+            if any(attribute not in element.attrib for attribute in required_attributes):
+                invalid_count += 1
+            if element.tag == "base_event":
+                event_count += 1
+                # Done with it and its children, detach them so the tree doesn't grow with the
+                # feed (the elements still to be read come with their own events)
+                output.clear()
+    except ElementTree.ParseError as e:
+        raise InvalidFeed(f"Malformed feed: {e}")
+
+    return event_count, invalid_count
@@ -74,19 +74,30 @@ class BaseSyncExternalEvents(ABC):
         pass
 
     @abstractmethod
-    def handle_bulk_update_or_create(model, records_ids_in_db, objects, fields):
+    def handle_bulk_update_or_create(model, objects_to_create, objects_to_update, fields):
         """
         Abstract static method to handle bulk update or create operations.
 
         Args:
             model: The model class for which bulk update or create is performed.
-            records_ids_in_db: A list of IDs already existing in the database.
-            objects: The objects to update or create.
+            objects_to_create: The new objects.
+            objects_to_update: The changed objects already existing in the database.
             fields: The fields to update in case of existing records.
         """
 
         pass
 
+    @abstractmethod
+    def sync_chunk(self, base_events):
+        """
+        Abstract method to parse and write a chunk of base events.
+
+        Args:
+            base_events: The base events data of the chunk.
+        """
+
+        pass
+
     @abstractmethod
     def start(self):
         """
@@ -0,0 +1,34 @@
+class IdSet:
+    """
+    Set of integer ids kept as a bitmap, one bit per id up to the highest one added, so the
+    ids of a whole feed take a few megabytes rather than the tens of a set of ints. The ids
+    that are negative or above max_bitmap_id go to a regular set.
+    """
+
+    def __init__(self, max_bitmap_id=1 << 26):
+        self.max_bitmap_id = max_bitmap_id
+        self.bitmap = bytearray()
+        self.others = set()
+
+    def __contains__(self, id_):
+        if 0 <= id_ <= self.max_bitmap_id:
+            byte = id_ >> 3
+            return byte < len(self.bitmap) and bool(self.bitmap[byte] & (1 << (id_ & 7)))
+
+        return id_ in self.others
+
+    def add(self, id_):
+        if not 0 <= id_ <= self.max_bitmap_id:
+            self.others.add(id_)
+            return
+
+        byte = id_ >> 3
+        if byte >= len(self.bitmap):
+            # Grown by doubling, up to the size of max_bitmap_id
+            size = min(max(byte + 1, 2 * len(self.bitmap)), (self.max_bitmap_id >> 3) + 1)
+            self.bitmap.extend(bytes(size - len(self.bitmap)))
+        self.bitmap[byte] |= 1 << (id_ & 7)
+
+    def update(self, ids):
+        for id_ in ids:
+            self.add(id_)
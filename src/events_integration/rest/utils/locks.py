@@ -0,0 +1,15 @@
+import zlib
+
+
+def get_advisory_lock_id(name):
+    """
+    Get the PostgreSQL advisory lock key of a name.
+
+    Args:
+        name (str): The name of the lock.
+
+    Returns:
+        int: A key that fits the int4 arguments of the advisory lock functions.
+    """
+
+    return zlib.crc32(name.encode()) & 0x7FFFFFFF
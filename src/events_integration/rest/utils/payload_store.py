@@ -0,0 +1,91 @@
+import glob
+import json
+import mmap
+import os
+import shutil
+
+from django.utils import timezone
+
+
+def save_payload(directory, name, payload, metadata):
+    """
+    Save a provider payload and its metadata to a directory, as <file>.xml and <file>.json.
+
+    Args:
+        directory (str): The directory, created if it doesn't exist.
+        name (str): The prefix of the file names, followed by the current datetime.
+        payload: The binary file-like object of the payload, read from the start.
+        metadata (dict): JSON serializable metadata of the payload (url, headers, reason...).
+
+    Returns:
+        str: The path of the saved payload.
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    file_name = f"{name}-{timezone.now():%Y%m%dT%H%M%S%f}"
+    payload_path = os.path.join(directory, f"{file_name}.xml")
+
+    payload.seek(0)
+    with open(payload_path, "wb") as payload_file:
+        shutil.copyfileobj(payload, payload_file)
+    payload.seek(0)
+
+    with open(os.path.join(directory, f"{file_name}.json"), "w") as metadata_file:
+        json.dump({**metadata, "saved_at": timezone.now().isoformat()}, metadata_file, indent=2, default=str)
+
+    return payload_path
+
+
+def get_payload_paths(directory):
+    """
+    Get the payloads saved to a directory, oldest first.
+
+    Args:
+        directory (str): The directory.
+
+    Returns:
+        list: The paths of the payloads.
+    """
+
+    return sorted(glob.glob(os.path.join(directory, "*.xml")))
+
+
+def load_metadata(payload_path):
+    """
+    Load the metadata saved with a payload.
+
+    Args:
+        payload_path (str): The path of the payload.
+
+    Returns:
+        dict: The metadata, empty if there isn't any.
+    """
+
+    metadata_path = f"{os.path.splitext(payload_path)[0]}.json"
+    if not os.path.exists(metadata_path):
+        return dict()
+
+    with open(metadata_path) as metadata_file:
+        return json.load(metadata_file)
+
+
+def open_payload(payload_path):
+    """
+    Open a payload saved to disk, memory-mapped so it is read through the page cache
+    without being copied into the process.
+
+    Args:
+        payload_path (str): The path of the payload.
+
+    Returns:
+        mmap.mmap: A read-only file-like object of the payload, to close once done.
+
+    Raises:
+        RuntimeError: If the file is empty.
+    """
+
+    with open(payload_path, "rb") as payload_file:
+        if os.fstat(payload_file.fileno()).st_size == 0:
+            raise RuntimeError(f"Empty payload file {payload_path}.")
+        # The mapping stays valid once the file is closed
+        return mmap.mmap(payload_file.fileno(), 0, access=mmap.ACCESS_READ)
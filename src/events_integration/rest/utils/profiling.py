@@ -0,0 +1,133 @@
+import cProfile
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+from django.utils import timezone
+from django.utils.text import slugify
+
+logger = logging.getLogger("sync_external_events")
+
+# cProfile can only profile one block at a time per process (enabling a second profiler
+# raises from Python 3.12), the threads of a worker take turns
+profile_lock = threading.Lock()
+
+
+class QueryStats:
+    """
+    Database execute wrapper counting the queries run and the time spent in them.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        # Set once the profiled block is done
+        self.total_duration = None
+        self.profile_path = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started_at
+
+
+def remove_old_profiles(directory, max_count):
+    """
+    Remove the oldest profiles of a directory, with their summaries, keeping max_count.
+
+    Args:
+        directory (str): The directory of the profiles.
+        max_count (int): The number of profiles kept.
+    """
+
+    # Newest first, by the datetime ending their names
+    profile_paths = sorted(
+        glob.glob(os.path.join(directory, "*.prof")), key=lambda path: path.rsplit("-", 1)[-1], reverse=True
+    )
+    for profile_path in profile_paths[max_count:]:
+        for path in (profile_path, f"{os.path.splitext(profile_path)[0]}.json"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Removed by another process
+                pass
+
+
+@contextmanager
+def profile(name, directory, metadata=None, max_count=None, blocking=True):
+    """
+    Profile a block with cProfile and count its SQL queries and their time.
+
+    The profile is dumped to <directory>/<name>-<datetime>.prof, to be read with pstats or
+    snakeviz, next to a .json summary with the total time, the SQL query count and the SQL
+    time, to compare with the time of the ORM, the serialization or the parsing.
+
+    Args:
+        name (str): The name of the profiled block, prefix of the file names.
+        directory (str): The directory of the files, created if it doesn't exist.
+        metadata (dict): Added to the summary, it can be completed in the block.
+        max_count (int): The number of profiles kept in the directory, the oldest are
+            removed. None keeps them all.
+        blocking (bool): Whether to wait for the block profiled by another thread, if any,
+            rather than running this one without profiling it.
+
+    Yields:
+        QueryStats: The SQL stats of the block, with the total duration and the profile
+            path once it is done. None if it isn't profiled.
+    """
+
+    if not profile_lock.acquire(blocking=blocking):
+        yield None
+        return
+
+    try:
+        with _profile(name, directory, metadata, max_count) as stats:
+            yield stats
+    finally:
+        profile_lock.release()
+
+
+@contextmanager
+def _profile(name, directory, metadata, max_count):
+    stats = QueryStats()
+    profiler = cProfile.Profile()
+    started_at = time.perf_counter()
+
+    with connection.execute_wrapper(stats):
+        profiler.enable()
+        try:
+            yield stats
+        finally:
+            profiler.disable()
+            stats.total_duration = time.perf_counter() - started_at
+
+            os.makedirs(directory, exist_ok=True)
+            file_name = f"{slugify(name)}-{timezone.now():%Y%m%dT%H%M%S%f}"
+            stats.profile_path = os.path.join(directory, f"{file_name}.prof")
+            profiler.dump_stats(stats.profile_path)
+
+            summary = {
+                **(metadata or {}),
+                "name": name,
+                "duration": stats.total_duration,
+                "sql_count": stats.count,
+                "sql_duration": stats.duration,
+                "profile": stats.profile_path,
+            }
+            with open(os.path.join(directory, f"{file_name}.json"), "w") as summary_file:
+                json.dump(summary, summary_file, indent=2, default=str)
+            if max_count is not None:
+                remove_old_profiles(directory, max_count)
+
+            logger.info(
+                "Profiled %s in %.3fs, %s SQL queries in %.3fs, profile saved to %s",
+                name, stats.total_duration, stats.count, stats.duration, stats.profile_path,
+            )
@@ -1,46 +1,204 @@
 import datetime
 import logging
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from typing import List
+from urllib.parse import urlparse
 
-import requests
 import xmltodict
-from rest_framework import status
-
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .circuit_breaker import CircuitBreaker
+from .data_version import bump_data_version
+from .feed_rows import (
+    EVENT_FIELDS, ZONE_FIELDS, add_event_row, add_zone_rows, get_event_and_zone_rows,
+    iter_base_event_chunks, parse_date, parse_feed_chunk,
+)
+from .feed_validation import InvalidFeed, inspect_feed
 from .handle_events import BaseSyncExternalEvents
-from events_integration.models import Event, Zone
+from .id_set import IdSet
+from .locks import get_advisory_lock_id
+from .payload_store import load_metadata, open_payload, save_payload
+from events_integration.models import Change, Event, Zone
 
 logger = logging.getLogger("sync_external_events")
 
 
+class InvalidPayload(RuntimeError):
+    """
+    The provider payload failed the validation, it is not applied.
+    """
+
+
 class SyncExternalEvents(BaseSyncExternalEvents):
     """
     A class for synchronizing external events.
     Inherits from BaseSyncExternalEvents.
     """
 
-    def __init__(self, api_path: str):
+    # Fields written from the feed, and diffed to build the change log
+    event_update_fields = [
+        "base_event_id", "organizer_company_id", "title", "sell_mode",
+        "event_start_datetime", "event_end_datetime", "sell_from", "sell_to", "sold_out",
+    ]
+    zone_update_fields = ["event_id", "name", "capacity", "price", "numbered"]
+
+    # Replays don't fetch the provider, they neither check nor change its circuit breaker
+    circuit_breaker_enabled = True
+    # Whether payloads with much fewer base events than the last one synced are rejected
+    event_count_check_enabled = True
+
+    def __init__(self, api_path: str, chunk_size: int = None, workers: int = None, provider: str = None,
+                 record: bool = False):
         """
         Initialize SyncExternalEvents instance.
 
         Args:
             api_path (str): The API path to retrieve external events data.
+            chunk_size (int): The number of base events parsed and written at a time,
+                SYNC_CHUNK_SIZE by default.
+            workers (int): The number of processes parsing the feed, SYNC_PARSE_WORKERS by
+                default. With 0 or 1 the feed is parsed in this process.
+            provider (str): The name of the provider, for its circuit breaker state and
+                quarantined payloads. The host of api_path by default.
+            record (bool): Whether to save the fetched payload to SYNC_RECORD_DIR.
         """
 
         super().__init__(api_path)
+        self.chunk_size = chunk_size or settings.SYNC_CHUNK_SIZE
+        self.workers = settings.SYNC_PARSE_WORKERS if workers is None else workers
+        self.base_events_chunk = list()
+        self.changed_event_count = 0
+        # Ids written by the previous chunks, and number of rows skipped as duplicates
+        self.synced_event_ids = IdSet()
+        self.synced_zone_ids = IdSet()
+        self.duplicate_count = 0
+        self.provider = provider or urlparse(api_path).netloc or api_path
+        self.record = record
+        self.circuit_breaker = None
+        self.payload = None
+        self.payload_metadata = dict()
+        self.event_count = None
 
     def handle_request(self):
         """
         Handle HTTP request to fetch external events data from the API.
 
+        The response is downloaded to a temporary file, kept in memory up to
+        SYNC_PAYLOAD_MEMORY_SIZE bytes, so it can be validated before it is applied.
+
         Raises:
-            RuntimeError: If the request fails or the response status code is not 200.
+            RuntimeError: If the request fails, the response status code is not 200, the
+                response is larger than SYNC_MAX_PAYLOAD_SIZE or shorter than its Content-Length.
         """
+        # Imported here, it is the slowest import of the sync and only needed to fetch
+        import requests
+
+        payload = tempfile.SpooledTemporaryFile(max_size=settings.SYNC_PAYLOAD_MEMORY_SIZE)
         try:
-            self.request = requests.get(self.api_path)
-            self.request.raise_for_status()
+            with requests.get(self.api_path, stream=True, timeout=settings.SYNC_REQUEST_TIMEOUT) as response:
+                self.request = response
+                response.raise_for_status()
+                size = 0
+                for block in response.iter_content(chunk_size=64 * 1024):
+                    size += len(block)
+                    if size > settings.SYNC_MAX_PAYLOAD_SIZE:
+                        raise RuntimeError(f"Response larger than {settings.SYNC_MAX_PAYLOAD_SIZE} bytes.")
+                    payload.write(block)
+
+                # urllib3 1.x doesn't enforce the Content-Length, a connection closed early just
+                # ends the body. It is the size on the wire, compared with the raw bytes read.
+                content_length = response.headers.get("Content-Length")
+                if content_length and content_length.isdigit() and response.raw.tell() < int(content_length):
+                    raise RuntimeError(
+                        f"Truncated response: {response.raw.tell()} of {content_length} bytes received."
+                    )
         except requests.exceptions.RequestException as e:
+            payload.close()
             # Connection error
             raise RuntimeError(f"Failed to fetch data from API: {e}")
+        except RuntimeError:
+            payload.close()
+            raise
+
+        payload.seek(0)
+        self.payload = payload
+        self.payload_metadata = {
+            "provider": self.provider,
+            "url": self.api_path,
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "size": size,
+            "fetched_at": timezone.now().isoformat(),
+        }
+        if self.record:
+            self.record_payload()
+
+    def record_payload(self):
+        """
+        Save the fetched payload with its metadata to SYNC_RECORD_DIR, to be replayed.
+        """
+
+        path = save_payload(settings.SYNC_RECORD_DIR, slugify(self.provider), self.payload, self.payload_metadata)
+        logger.info("Payload of %s recorded to %s", self.provider, path)
+
+    def validate_payload(self):
+        """
+        Check the fetched payload before anything is written: it must be a well-formed feed,
+        with at least SYNC_MIN_EVENT_COUNT_RATIO of the base events of the last applied one
+        (unless event_count_check_enabled is off), and at most SYNC_MAX_INVALID_RATIO of
+        elements missing a required attribute.
+
+        Raises:
+            InvalidPayload: If a check fails.
+        """
+
+        try:
+            event_count, invalid_count = inspect_feed(self.payload)
+        except InvalidFeed as e:
+            raise InvalidPayload(str(e))
+        finally:
+            self.payload.seek(0)
+
+        last_event_count = self.circuit_breaker.state.last_event_count
+        min_event_count_ratio = settings.SYNC_MIN_EVENT_COUNT_RATIO
+        if (
+            self.event_count_check_enabled and last_event_count
+            and event_count < last_event_count * min_event_count_ratio
+        ):
+            raise InvalidPayload(
+                f"{event_count} base events, less than {min_event_count_ratio:.0%} "
+                f"of the {last_event_count} of the last sync."
+            )
+
+        max_invalid_ratio = settings.SYNC_MAX_INVALID_RATIO
+        if invalid_count > max(event_count, 1) * max_invalid_ratio:
+            raise InvalidPayload(
+                f"{invalid_count} elements missing required attributes for {event_count} base events."
+            )
+
+        self.event_count = event_count
+
+    def quarantine_payload(self, reason):
+        """
+        Save a rejected payload with its metadata to SYNC_QUARANTINE_DIR, to be inspected
+        or replayed.
+
+        Args:
+            reason (str): Why the payload was rejected.
+        """
+
+        path = save_payload(
+            settings.SYNC_QUARANTINE_DIR, slugify(self.provider), self.payload,
+            {**self.payload_metadata, "reason": reason},
+        )
+        logger.error("Payload of %s rejected (%s), quarantined to %s", self.provider, reason, path)
 
     @staticmethod
     def parse_date(datetime_str: str, datetime_parser_mask="%Y-%m-%dT%H:%M:%S"):
@@ -55,28 +213,7 @@ class SyncExternalEvents(BaseSyncExternalEvents):
             datetime: The parsed datetime object.
         """
 
-        return datetime.datetime.strptime(datetime_str, datetime_parser_mask)
-
-    @staticmethod
-    def add_zone(zone, event_id, zone_data_dict):
-        """
-        Add zone data to the zone data dictionary.
-
-        Args:
-            zone: The zone data to add.
-            event_id (int): The ID of the event associated with the zone.
-            zone_data_dict (dict): The dictionary to store the zone data.
-        """
-
-        zone_data = dict()
-        zone_data_id = int(zone["@zone_id"])
-        zone_data["id"] = zone_data_id
-        zone_data["event_id"] = event_id
-        zone_data["capacity"] = int(zone["@capacity"])
-        zone_data["price"] = float(zone["@price"])
-        zone_data["name"] = zone["@name"]
-        zone_data["numbered"] = zone["@numbered"] == "true"
-        zone_data_dict[zone_data_id] = Zone(**zone_data)
+        return parse_date(datetime_str, datetime_parser_mask)
 
     def parse_zone(self, event_zones, event_id, zone_data_dict):
         """
@@ -85,14 +222,10 @@ class SyncExternalEvents(BaseSyncExternalEvents):
         Args:
             event_zones: The zone data for an event.
             event_id (int): The ID of the event.
-            zone_data_dict (dict): A dictionary to store parsed zone data.
+            zone_data_dict (dict): A dictionary to store the parsed zone rows.
         """
 
-        if isinstance(event_zones, list):
-            for zone in event_zones:
-                self.add_zone(zone, event_id, zone_data_dict)
-        else:
-            self.add_zone(event_zones, event_id, zone_data_dict)
+        add_zone_rows(event_zones, event_id, zone_data_dict)
 
     def parse_event(self, base_event, event, event_data_dict):
         """
@@ -101,28 +234,10 @@ class SyncExternalEvents(BaseSyncExternalEvents):
         Args:
             base_event: The base event data.
             event: The event data.
-            event_data_dict (dict): A dictionary to store parsed event data.
+            event_data_dict (dict): A dictionary to store the parsed event rows.
         """
 
-        try:
-            event_id = int(event["@event_id"])
-            event_data = {
-                "id": event_id,
-                "base_event_id": int(base_event["@base_event_id"]),
-                "organizer_company_id": base_event.get("@organizer_company_id", None),
-                "title": base_event["@title"],
-                "sell_mode": base_event["@sell_mode"],
-                "event_start_datetime": self.parse_date(event["@event_start_date"]),
-                "event_end_datetime": self.parse_date(event["@event_end_date"]),
-                "sell_from": self.parse_date(event["@sell_from"]),
-                "sell_to": self.parse_date(event["@sell_to"]),
-                "sold_out": event["@sold_out"] == "true",
-            }
-
-            event_data_dict[event_id] = Event(**event_data)
-        except Exception as exc:
-            # Invalid data
-            pass
+        add_event_row(base_event, event, event_data_dict)
 
     def get_events_and_zones_to_update(self, base_events):
         """
@@ -132,71 +247,420 @@ class SyncExternalEvents(BaseSyncExternalEvents):
             base_events (List): The list of base events data.
 
         Returns:
-            tuple: A tuple containing dictionaries of events and zones data.
+            tuple: A tuple containing dictionaries of events and zones rows,
+                as EVENT_FIELDS and ZONE_FIELDS tuples.
         """
 
-        event_data_dict = dict()
-        zone_data_dict = dict()
-
-        for base_event in base_events:
-            sell_mode = base_event["@sell_mode"]
-            if sell_mode == "online":
-                event = base_event["event"]
-                event_zones = event["zone"]
-                event_id = int(event["@event_id"])
-
-                self.parse_zone(event_zones, event_id, zone_data_dict)
-                self.parse_event(base_event, event, event_data_dict)
-
-        return event_data_dict, zone_data_dict
+        return get_event_and_zone_rows(base_events)
     
     @staticmethod
-    def handle_bulk_update_or_create(model, records_ids_in_db, objects, fields):
+    def handle_bulk_update_or_create(model, objects_to_create, objects_to_update, fields):
         """
         Perform bulk update or create operations.
 
         Args:
             model: The model class for which bulk update or create is performed.
-            records_ids_in_db: A list of IDs already existing in the database.
-            obj (dict): A dictionary containing objects to update or create.
+            objects_to_create (list): The new objects.
+            objects_to_update (list): The changed objects already existing in the database.
             fields (list): The fields to update in case of existing records.
         """
 
-        objects_to_create = list()
-        objects_to_update = list()
-
-        for key, value in objects.items():
-            if key in records_ids_in_db:
-                objects_to_update.append(value)
-            else:
-                objects_to_create.append(value)
+        # bulk_update() skips the auto_now fields, keep modification_datetime accurate for the
+        # search API validators
+        modification_datetime = timezone.now()
+        for obj in objects_to_update:
+            obj.modification_datetime = modification_datetime
 
         model.objects.bulk_create(objects_to_create, ignore_conflicts=True)
-        model.objects.bulk_update(objects_to_update, fields=fields)
+        model.objects.bulk_update(objects_to_update, fields=[*fields, "modification_datetime"])
+
+    @staticmethod
+    def update_search_vectors(event_ids):
+        """
+        Update the full-text search vector of the title of the events.
+
+        Args:
+            event_ids: The IDs of the events to update.
+        """
+
+        Event.objects.filter(id__in=event_ids).update(
+            search_vector=SearchVector("title", config=settings.EVENTS_SEARCH_TEXT_CONFIG)
+        )
+
+    @staticmethod
+    def get_changes(fields, old_values, new_values):
+        """
+        Get the fields whose value changed, as {field: [old value, new value]}.
+        """
+
+        return {
+            field: [old_value, new_value]
+            for field, old_value, new_value in zip(fields, old_values, new_values)
+            if old_value != new_value
+        }
+
+    @staticmethod
+    def make_row_aware(row):
+        # The feed datetimes are naive, in the default time zone
+        return tuple(
+            timezone.make_aware(value) if isinstance(value, datetime.datetime) else value for value in row
+        )
+
+    @staticmethod
+    def lock_writes():
+        """
+        Wait until no other sync is writing, and keep them waiting until the end of the current
+        transaction. Only on PostgreSQL.
+        """
+
+        if connection.vendor != "postgresql":
+            return
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [get_advisory_lock_id("sync_external_events:write")])
+
+    def drop_duplicate_rows(self, event_rows, zone_rows):
+        """
+        Drop the rows of the events and zones written by a previous chunk of the feed, and the
+        zones of the dropped events. The first occurrence of an id wins, the later ones would
+        overwrite it, and be overwritten back by the following sync.
+
+        Args:
+            event_rows (dict): The event rows by ID, as EVENT_FIELDS tuples.
+            zone_rows (dict): The zone rows by ID, as ZONE_FIELDS tuples.
+        """
+
+        for event_id in [event_id for event_id in event_rows if event_id in self.synced_event_ids]:
+            del event_rows[event_id]
+            self.duplicate_count += 1
+        for zone_id in [
+            zone_id for zone_id, row in zone_rows.items()
+            if zone_id in self.synced_zone_ids or row[1] not in event_rows
+        ]:
+            del zone_rows[zone_id]
+            self.duplicate_count += 1
+
+        self.synced_event_ids.update(event_rows)
+        self.synced_zone_ids.update(zone_rows)
+
+    def write_rows(self, event_rows, zone_rows):
+        """
+        Write the events and zones rows of a chunk, but the ones already written by a
+        previous chunk of the feed.
+
+        Args:
+            event_rows (dict): The event rows by ID, as EVENT_FIELDS tuples.
+            zone_rows (dict): The zone rows by ID, as ZONE_FIELDS tuples.
+        """
+
+        self.drop_duplicate_rows(event_rows, zone_rows)
+        self.changed_event_count += len(self.save_rows(event_rows, zone_rows))
+
+    def save_rows(self, event_rows, zone_rows):
+        """
+        Save events and zones rows to the database, with a Change for each created, updated
+        or removed record.
+
+        Only the records whose values changed are updated. The zones stored for the events
+        of the rows that are not in them anymore are removed, the events are kept.
+
+        Args:
+            event_rows (dict): The event rows by ID, as EVENT_FIELDS tuples.
+            zone_rows (dict): The zone rows by ID, as ZONE_FIELDS tuples.
+
+        Returns:
+            set: The IDs of the events changed, or whose zones changed.
+        """
+
+        # The syncs write one at a time: each chunk is diffed against the data committed by the
+        # others, and the Change ids are committed in increasing order, as the consumers paging
+        # the log by id expect. The change log is written with the data, consumers never see
+        # one without the other.
+        with transaction.atomic():
+            self.lock_writes()
+
+            event_fields = self.event_update_fields
+            zone_fields = self.zone_update_fields
+            changes = list()
+            events_to_create, events_to_update = list(), list()
+            zones_to_create, zones_to_update = list(), list()
+            title_changed_event_ids = list()
+            changed_event_ids = set()
+
+            events_in_db = {
+                event_id: (event_uuid, values)
+                for event_id, event_uuid, *values in Event.objects.filter(
+                    id__in=event_rows.keys()
+                ).values_list("id", "uuid", *event_fields)
+            }
+            event_uuids = {event_id: event_uuid for event_id, (event_uuid, _) in events_in_db.items()}
+
+            for event_id, row in event_rows.items():
+                data = dict(zip(EVENT_FIELDS, self.make_row_aware(row)))
+                new_values = [data[field] for field in event_fields]
+                event = Event(**data)
+
+                if event_id in events_in_db:
+                    event_uuid, old_values = events_in_db[event_id]
+                    action = Change.ACTION_UPDATED
+                    events_to_update.append(event)
+                else:
+                    event_uuid, old_values = event.uuid, [None] * len(event_fields)
+                    action = Change.ACTION_CREATED
+                    events_to_create.append(event)
+                    event_uuids[event_id] = event_uuid
+
+                event_changes = self.get_changes(event_fields, old_values, new_values)
+                if not event_changes:
+                    events_to_update.pop()
+                    continue
+
+                if "title" in event_changes:
+                    title_changed_event_ids.append(event_id)
+                changed_event_ids.add(event_id)
+                changes.append(Change(
+                    entity=Change.ENTITY_EVENT, entity_id=event_id, event_uuid=event_uuid,
+                    action=action, changes=event_changes,
+                ))
+
+            # The zones of the chunk, and the other zones of its events
+            zones_in_db = {
+                zone_id: values
+                for zone_id, *values in Zone.objects.filter(
+                    Q(id__in=zone_rows.keys()) | Q(event_id__in=event_rows.keys())
+                ).values_list("id", *zone_fields)
+            }
+
+            for zone_id, row in zone_rows.items():
+                data = dict(zip(ZONE_FIELDS, row))
+                new_values = [data[field] for field in zone_fields]
+                zone = Zone(**data)
+
+                if zone_id in zones_in_db:
+                    old_values = zones_in_db.pop(zone_id)
+                    action = Change.ACTION_UPDATED
+                    zones_to_update.append(zone)
+                else:
+                    old_values = [None] * len(zone_fields)
+                    action = Change.ACTION_CREATED
+                    zones_to_create.append(zone)
+
+                zone_changes = self.get_changes(zone_fields, old_values, new_values)
+                if not zone_changes:
+                    zones_to_update.pop()
+                    continue
+
+                changed_event_ids.add(data["event_id"])
+                changes.append(Change(
+                    entity=Change.ENTITY_ZONE, entity_id=zone_id, event_uuid=event_uuids.get(data["event_id"]),
+                    action=action, changes=zone_changes,
+                ))
+
+            # Left, the zones of the events of the chunk missing from the feed
+            zone_ids_to_remove = list()
+            for zone_id, old_values in zones_in_db.items():
+                event_id = old_values[zone_fields.index("event_id")]
+                zone_ids_to_remove.append(zone_id)
+                changed_event_ids.add(event_id)
+                changes.append(Change(
+                    entity=Change.ENTITY_ZONE, entity_id=zone_id, event_uuid=event_uuids.get(event_id),
+                    action=Change.ACTION_REMOVED,
+                    changes=self.get_changes(zone_fields, old_values, [None] * len(zone_fields)),
+                ))
+
+            self.handle_bulk_update_or_create(Event, events_to_create, events_to_update, event_fields)
+            self.update_search_vectors([event.id for event in events_to_create] + title_changed_event_ids)
+
+            Zone.objects.filter(id__in=zone_ids_to_remove).delete()
+            # As with a changed zone, the export lists the events as modified
+            Event.objects.filter(
+                id__in={zones_in_db[zone_id][zone_fields.index("event_id")] for zone_id in zone_ids_to_remove}
+            ).update(modification_datetime=timezone.now())
+            self.handle_bulk_update_or_create(Zone, zones_to_create, zones_to_update, zone_fields)
+
+            Change.objects.bulk_create(changes)
+
+        return changed_event_ids
+
+    def sync_chunk(self, base_events):
+        """
+        Parse a chunk of base events and write its events and zones to the database.
+
+        Args:
+            base_events (List): The base events data of the chunk.
+        """
+
+        self.write_rows(*self.get_events_and_zones_to_update(base_events))
+
+    def sync_in_workers(self, stream):
+        """
+        Parse the feed in a pool of processes and write the rows they return in order.
+
+        The parent only splits the feed into byte ranges of whole base events, the XML
+        parsing and the conversion of the values run in the workers. At most two chunks
+        per worker are in flight, so the memory used doesn't depend on the size of the feed.
+
+        Args:
+            stream: The binary file-like object of the feed.
+        """
+
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for content in iter_base_event_chunks(stream, self.chunk_size):
+                pending.append(executor.submit(parse_feed_chunk, content))
+                if len(pending) >= 2 * self.workers:
+                    self.write_rows(*pending.popleft().result())
+
+            while pending:
+                self.write_rows(*pending.popleft().result())
+
+    def handle_base_event(self, path, base_event):
+        """
+        Collect a base event parsed from the feed, syncing the chunk once it is full.
+
+        Args:
+            path: The path of the base event element in the feed, as (name, attributes) pairs.
+            base_event (dict): The children of the base event element.
+
+        Returns:
+            bool: True, to keep parsing the feed.
+        """
+
+        # When streaming, xmltodict gives the attributes of the element in its path
+        _, attributes = path[-1]
+        base_event = {
+            **{f"@{name}": value for name, value in (attributes or {}).items()},
+            **(base_event or {}),
+        }
+        self.base_events_chunk.append(base_event)
+        if len(self.base_events_chunk) >= self.chunk_size:
+            self.sync_chunk(self.base_events_chunk)
+            self.base_events_chunk = list()
+
+        return True
+
+    def apply_payload(self):
+        """
+        Parse the payload and sync it in chunks of base events, so the memory used doesn't
+        depend on the size of the feed.
+        """
+
+        if self.workers > 1:
+            self.sync_in_workers(self.payload)
+        else:
+            # eventList > output > base_event
+            xmltodict.parse(self.payload, item_depth=3, item_callback=self.handle_base_event)
+
+        if self.base_events_chunk:
+            self.sync_chunk(self.base_events_chunk)
+            self.base_events_chunk = list()
+
+        if self.duplicate_count:
+            logger.warning(
+                "%s event and zone rows of %s skipped, their ids were already in the feed",
+                self.duplicate_count, self.provider,
+            )
 
     def start(self):
         """
         Start the synchronization process.
+
+        Fetches are skipped while the circuit breaker of the provider is open. A payload
+        that fails the validation is quarantined and nothing is written, the stored events
+        (and the caches of the search API) stay as they were. A payload that fails while
+        it is applied is quarantined too, the chunks written before the failure are kept.
+
+        Raises:
+            RuntimeError: If the fetch fails or the payload is rejected.
+            Exception: The error raised while applying the payload.
         """
 
-        self.handle_request()
+        self.circuit_breaker = CircuitBreaker(self.provider)
+        if self.circuit_breaker_enabled and self.circuit_breaker.is_open():
+            logger.warning(
+                "Sync of %s skipped, circuit open until %s",
+                self.provider, self.circuit_breaker.state.opened_until,
+            )
+            return
 
-        xml_dict = xmltodict.parse(self.request.content)
-        
-        base_events = xml_dict["eventList"]["output"]["base_event"]
+        try:
+            self.handle_request()
+            self.validate_payload()
+        except InvalidPayload as e:
+            self.quarantine_payload(str(e))
+            self.payload.close()
+            if self.circuit_breaker_enabled:
+                self.circuit_breaker.record_failure(e)
+            raise
+        except RuntimeError as e:
+            if self.circuit_breaker_enabled:
+                self.circuit_breaker.record_failure(e)
+            raise
 
-        event_data_dict, zone_data_dict = self.get_events_and_zones_to_update(base_events)
+        try:
+            self.apply_payload()
+        except Exception as e:
+            self.quarantine_payload(f"Failed to apply the payload: {e!r}")
+            if self.circuit_breaker_enabled:
+                self.circuit_breaker.record_failure(e)
+            raise
+        else:
+            if self.circuit_breaker_enabled:
+                self.circuit_breaker.record_success(self.event_count)
+        finally:
+            self.payload.close()
+            if self.changed_event_count:
+                # Let the search caches and the event index know the stored events changed,
+                # also after a failure for the chunks committed before it
+                bump_data_version()
 
-        event_ids_in_db = Event.objects.filter(id__in=event_data_dict.keys()).values_list("id", flat=True)
-        self.handle_bulk_update_or_create(
-            Event, event_ids_in_db, event_data_dict, ["event_start_datetime", "event_end_datetime", "sell_from", "sell_to", "sell_mode"]
-        )
 
-        zone_ids_in_db = Zone.objects.filter(id__in=zone_data_dict.keys()).values_list("id", flat=True)
-        self.handle_bulk_update_or_create(
-            Zone, zone_ids_in_db, zone_data_dict, ["capacity", "price", "numbered", "event_id"]
+class ReplaySyncExternalEvents(SyncExternalEvents):
+    """
+    Sync from a payload saved to disk (recorded, or quarantined) instead of the provider,
+    through the same validation, parse and write pipeline.
+    """
+
+    circuit_breaker_enabled = False
+    # Older or quarantined payloads, smaller than the last one synced, can be replayed
+    event_count_check_enabled = False
+    # Provider of the payloads saved without metadata, rather than their path
+    replay_provider = "replay"
+
+    def __init__(self, payload_path: str, chunk_size: int = None, workers: int = None):
+        """
+        Initialize ReplaySyncExternalEvents instance.
+
+        Args:
+            payload_path (str): The path of the payload, its provider is taken from the
+                metadata saved with it, replay_provider without metadata.
+            chunk_size (int): The number of base events parsed and written at a time,
+                SYNC_CHUNK_SIZE by default.
+            workers (int): The number of processes parsing the feed, SYNC_PARSE_WORKERS by
+                default. With 0 or 1 the feed is parsed in this process.
+        """
+
+        self.recorded_metadata = load_metadata(payload_path)
+        super().__init__(
+            payload_path, chunk_size=chunk_size, workers=workers,
+            provider=self.recorded_metadata.get("provider", None) or self.replay_provider,
         )
 
+    def handle_request(self):
+        """
+        Open the payload file, memory-mapped.
+
+        Raises:
+            RuntimeError: If the file is empty.
+        """
+
+        self.payload = open_payload(self.api_path)
+        self.payload_metadata = {**self.recorded_metadata, "replayed_from": self.api_path}
+
+    def quarantine_payload(self, reason):
+        # Already on disk
+        logger.error("Replayed payload %s rejected (%s)", self.api_path, reason)
+
 # class SyncExternalEvents:
 #     def __init__(self, api_path: str):
 #         self.api_path = api_path
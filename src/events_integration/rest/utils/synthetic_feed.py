@@ -0,0 +1,45 @@
+"""
+Synthetic provider feeds, to measure the sync on feeds of any size without a provider.
+"""
+
+import io
+
+
+class SyntheticFeed(io.RawIOBase):
+    """
+    Binary stream of a provider feed of event_count base events, generated as it is read.
+    """
+
+    def __init__(self, event_count):
+        self.parts = self.iter_parts(event_count)
+        self.buffer = bytearray()
+
+    @staticmethod
+    def iter_parts(event_count):
+        yield b'<?xml version="1.0" encoding="UTF-8"?><eventList version="1.0"><output>'
+        for number in range(1, event_count + 1):
+            day = 1 + number % 28
+            yield (
+                f'<base_event base_event_id="{number}" sell_mode="online" title="Event {number}">'
+                f'<event event_start_date="2030-06-{day:02d}T20:00:00" event_end_date="2030-06-{day:02d}T22:00:00" '
+                f'event_id="{number}" sell_from="2030-01-01T00:00:00" sell_to="2030-06-01T00:00:00" sold_out="false">'
+                f'<zone zone_id="{number * 10 + 1}" capacity="100" price="20.00" name="A" numbered="true" />'
+                f'<zone zone_id="{number * 10 + 2}" capacity="50" price="30.00" name="B" numbered="false" />'
+                f'</event></base_event>'
+            ).encode()
+        yield b'</output></eventList>'
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while len(self.buffer) < len(buffer):
+            part = next(self.parts, None)
+            if part is None:
+                break
+            self.buffer += part
+
+        size = min(len(buffer), len(self.buffer))
+        buffer[:size] = self.buffer[:size]
+        del self.buffer[:size]
+        return size
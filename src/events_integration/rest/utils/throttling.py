@@ -0,0 +1,175 @@
+import math
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.throttling import BaseThrottle
+
+from .locks import get_advisory_lock_id
+
+
+class Throttled(APIException):
+    """
+    Throttled exception with the error format of the API. DRF sets the
+    Retry-After header of the response from its wait attribute.
+    """
+
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+
+    def __init__(self, wait, error_message="Request was throttled."):
+        self.wait = max(math.ceil(wait), 1)
+        error_message = f"{error_message} Expected available in {self.wait} seconds."
+        detail = {"error": {"message": error_message, "code": self.status_code}, "data": None}
+        super().__init__(detail, code=self.status_code)
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Requests of each client (authenticated user, or IP address otherwise) limited to `burst`
+    at once and `rate` per second on average, with a sliding window counter.
+
+    The allowed requests are counted in the shared cache per fixed window of burst / rate
+    seconds. A request is allowed if the count of the current window, plus the count of the
+    previous one weighted by the part of it still covered by the sliding window, stays within
+    `burst`. So no more than `burst` requests get through at once, including across a window
+    boundary, and no more than burst + rate * T over T seconds, as with a token bucket.
+
+    The counters are only updated with cache.add, cache.incr and cache.decr, which are atomic
+    across processes with memcached (see the events_integration.W001 check).
+    """
+
+    rate_setting = None
+    burst_setting = None
+    cache_key_prefix = "throttle"
+
+    def __init__(self):
+        self.rate = getattr(settings, self.rate_setting)
+        self.burst = getattr(settings, self.burst_setting)
+        self.wait_seconds = None
+
+    def get_cache_key(self, request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            ident = f"user:{user.pk}"
+        else:
+            ident = f"ip:{self.get_ident(request)}"
+
+        return f"{self.cache_key_prefix}:{ident}"
+
+    def allow_request(self, request, view):
+        if not self.rate:
+            return True
+
+        window = self.burst / self.rate
+        now = time.time()
+        window_index = int(now // window)
+        # Part of the current window elapsed
+        elapsed = now / window - window_index
+        cache_key = self.get_cache_key(request)
+        current_key = f"{cache_key}:{window_index}"
+        # Kept while it is the previous window
+        timeout = math.ceil(2 * window) + 1
+
+        previous_count = cache.get(f"{cache_key}:{window_index - 1}", 0)
+        cache.add(current_key, 0, timeout=timeout)
+        try:
+            count = cache.incr(current_key)
+        except ValueError:
+            # Expired or evicted between add and incr
+            cache.add(current_key, 1, timeout=timeout)
+            count = 1
+
+        if previous_count * (1 - elapsed) + count <= self.burst:
+            return True
+
+        # Only the allowed requests are counted, a client sending too many gets through again
+        # at the average rate
+        try:
+            count = cache.decr(current_key)
+        except ValueError:
+            count = 0
+        self.wait_seconds = self.get_wait(window, elapsed, previous_count, count)
+        return False
+
+    def get_wait(self, window, elapsed, previous_count, count):
+        """
+        Get the time until the next request of the client is allowed.
+
+        Args:
+            window (float): The length of the windows, in seconds.
+            elapsed (float): The part of the current window elapsed.
+            previous_count (int): The requests allowed in the previous window.
+            count (int): The requests allowed in the current window.
+
+        Returns:
+            float: The number of seconds to wait.
+        """
+
+        if count < self.burst:
+            # Once enough of the previous window has slid out
+            allowed_at = 1 - (self.burst - count - 1) / previous_count if previous_count else 0
+        else:
+            # In the next window, with the current one as the previous
+            allowed_at = 2 - (self.burst - 1) / count
+
+        return max(allowed_at - elapsed, 0) * window
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class EventsSearchThrottle(SlidingWindowThrottle):
+    rate_setting = "EVENTS_SEARCH_THROTTLE_RATE"
+    burst_setting = "EVENTS_SEARCH_THROTTLE_BURST"
+    cache_key_prefix = "throttle:events_search"
+
+
+class EventsExportThrottle(SlidingWindowThrottle):
+    rate_setting = "EVENTS_EXPORT_THROTTLE_RATE"
+    burst_setting = "EVENTS_EXPORT_THROTTLE_BURST"
+    cache_key_prefix = "throttle:events_export"
+
+
+@contextmanager
+def concurrency_limit(name, limit, retry_after=1):
+    """
+    Limit the number of blocks with the same name run at the same time by all the
+    processes using the database.
+
+    Each running block holds one of `limit` session level advisory locks, which PostgreSQL
+    releases with the connection if the worker dies holding it. The limit is only enforced
+    on PostgreSQL.
+
+    Args:
+        name (str): The name of the limited blocks.
+        limit (int): The maximum number of concurrent blocks, 0 for no limit.
+        retry_after (int): Seconds the client is asked to wait when the limit is reached.
+
+    Raises:
+        Throttled: If the limit is reached.
+    """
+
+    if not limit or connection.vendor != "postgresql":
+        yield
+        return
+
+    lock_id = get_advisory_lock_id(f"concurrency:{name}")
+    with connection.cursor() as cursor:
+        # The slots are tried in order until one is free, in a single round trip
+        cursor.execute(
+            "SELECT slot FROM generate_series(0, %s) AS slot WHERE pg_try_advisory_lock(%s, slot) LIMIT 1",
+            [limit - 1, lock_id],
+        )
+        row = cursor.fetchone()
+    if row is None:
+        raise Throttled(retry_after, error_message="Too many concurrent requests.")
+
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s, %s)", [lock_id, row[0]])
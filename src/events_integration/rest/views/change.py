@@ -0,0 +1,65 @@
+import logging
+
+from django.conf import settings
+from rest_framework import viewsets, mixins
+from rest_framework.response import Response
+
+from events_integration.models import Change
+from events_integration.rest.serializers.change import ChangeSerializer
+from .mixins import SearchLimitsMixin, SearchParamsMixin
+
+# Swagger imports
+from drf_yasg.utils import swagger_auto_schema
+from .schemas import ChangesAutoSchema
+
+logger = logging.getLogger("sync_external_events")
+
+
+class ChangesView(SearchLimitsMixin, SearchParamsMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    Change log of the events and zones written by the sync, read with a cursor: each
+    response gives the sequence to pass as since to get the following changes.
+    """
+
+    model = Change
+    serializer_class = ChangeSerializer
+
+    def get_cursor(self):
+        since = self._parse_query_param("since", int)
+        if since is None:
+            since = 0
+        elif since < 0:
+            self._raise_parse_error("Query param: 'since' can't be negative.")
+
+        page_size = settings.CHANGES_PAGE_SIZE
+        limit = self._parse_query_param("limit", int)
+        if limit is None:
+            limit = page_size
+        elif not 0 < limit <= page_size:
+            self._raise_parse_error(f"Query param: 'limit' must be between 1 and {page_size}.")
+
+        return since, limit
+
+    def get_queryset(self):
+        return self.model.objects.order_by('id')
+
+    @swagger_auto_schema(auto_schema=ChangesAutoSchema)
+    def list(self, request, *args, **kwargs):
+        since, limit = self.get_cursor()
+
+        with self.search_concurrency_limit():
+            changes = list(self.get_queryset().filter(id__gt=since)[:limit + 1])
+
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        serializer = self.get_serializer(changes, many=True)
+        response_data = {
+            "data": {
+                "changes": serializer.data,
+                "next": changes[-1].id if changes else since,
+                "has_more": has_more,
+            },
+            "error": None,
+        }
+
+        return Response(response_data)
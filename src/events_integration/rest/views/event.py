@@ -1,159 +1,307 @@
-import datetime
+import hashlib
 import logging
+from bisect import bisect_left, bisect_right
 
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery
+from django.core.cache import cache
+from django.db.models import Exists, Max, Min, OuterRef, Prefetch, Q
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
 from rest_framework import viewsets, mixins, status
-from rest_framework.exceptions import ParseError
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
-from events_integration.models import Event
-from events_integration.rest.serializers.event import EventSerializer
+from events_integration.models import Event, Zone
+from events_integration.rest.serializers.event import EventSerializer, EventWithZonesSerializer
+from events_integration.rest.utils.compression import compress, get_accepted_encoding, set_response_content
+from events_integration.rest.utils.data_version import get_data_version_state
+from events_integration.rest.utils.event_index import event_index
+
+from .mixins import SampledProfilingMixin, SearchLimitsMixin, SearchParamsMixin
 
 # Swagger imports
 from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from .schemas import EventsSearchAutoSchema, EventsSearchBatchAutoSchema
 
 logger = logging.getLogger("sync_external_events")
 
 
-class EventsView(mixins.ListModelMixin, viewsets.GenericViewSet):
+class EventsView(SampledProfilingMixin, SearchLimitsMixin, SearchParamsMixin, mixins.ListModelMixin,
+                 viewsets.GenericViewSet):
     model = Event
     serializer_class = EventSerializer
+    profile_sample_rate_setting = "EVENTS_SEARCH_PROFILE_SAMPLE_RATE"
+    allowed_includes = {"zones"}
+    max_text_query_length = 256
 
-    @staticmethod
-    def _datetime_string_parser(datetime_str: str, datetime_parser_mask="%Y-%m-%dT%H:%M:%SZ"):
-        errored = False
-        date_time_obj = None
-        try:
-            date_time_obj = datetime.datetime.strptime(datetime_str, datetime_parser_mask)
-        except:
-            errored = True
+    def get_includes(self):
+        includes = self.request.query_params.get("include", None)
+        if not includes:
+            return set()
+
+        includes = set(includes.split(","))
+        if not includes <= self.allowed_includes:
+            self._raise_parse_error("Query param: 'include' malformed.")
+
+        return includes
+
+    def get_serializer_class(self):
+        if "zones" in self.get_includes():
+            return EventWithZonesSerializer
+        return super().get_serializer_class()
+
+    def get_search_filters(self):
+        """
+        Parse the optional filters of the search.
+
+        Returns:
+            tuple: The lookups to apply to the events and the lookups that at least one
+                zone of each event has to match.
+        """
+
+        event_filters = dict()
+        zone_filters = dict()
+
+        q = self.request.query_params.get("q", "").strip()
+        if q:
+            if len(q) > self.max_text_query_length:
+                self._raise_parse_error(
+                    f"Query param: 'q' can't be longer than {self.max_text_query_length} characters."
+                )
+            event_filters["search_vector"] = SearchQuery(
+                q, config=settings.EVENTS_SEARCH_TEXT_CONFIG, search_type="websearch"
+            )
+
+        sold_out = self._parse_query_param("sold_out", self._boolean_parser)
+        if sold_out is not None:
+            event_filters["sold_out"] = sold_out
+
+        for name, lookup, parser in (
+            ("min_price", "price__gte", float),
+            ("max_price", "price__lte", float),
+            ("numbered", "numbered", self._boolean_parser),
+            ("min_capacity", "capacity__gte", int),
+        ):
+            value = self._parse_query_param(name, parser)
+            if value is not None:
+                zone_filters[lookup] = value
+
+        return event_filters, zone_filters
+
+    def get_events_queryset(self, windows):
+        """
+        Get the events of any of the search windows, filtered.
 
-        return errored, date_time_obj
+        Args:
+            windows: The (starts_at, ends_at) search windows.
+
+        Returns:
+            The Event queryset.
+        """
+
+        event_filters, zone_filters = self.get_search_filters()
+        windows_filter = Q()
+        for starts_at, ends_at in windows:
+            windows_filter |= Q(event_start_datetime__gte=starts_at, event_end_datetime__lte=ends_at)
+
+        queryset = self.model.objects.filter(windows_filter, **event_filters)
+        if zone_filters:
+            queryset = queryset.filter(Exists(Zone.objects.filter(event=OuterRef('pk'), **zone_filters)))
+
+        return queryset
+
+    def get_events(self, windows):
+        """
+        Get the events of any of the search windows, from the event index when enabled and
+        covering all the windows, from the database otherwise.
+
+        Args:
+            windows: The (starts_at, ends_at) search windows.
+
+        Returns:
+            The IndexedEvent list or the Event queryset, sorted by start datetime.
+        """
+
+        # The index only knows the titles and price ranges of the events, filtered and text
+        # searches and the ones including the zones go to the database
+        if settings.EVENT_INDEX_ENABLED and not any(self.get_search_filters()) and not self.get_includes():
+            event_index.refresh()
+            events_by_id = dict()
+            for starts_at, ends_at in windows:
+                window_events = event_index.search(starts_at, ends_at)
+                if window_events is None:
+                    break
+                events_by_id.update((event.id, event) for event in window_events)
+            else:
+                return sorted(events_by_id.values(), key=lambda event: event.event_start_datetime)
+
+        queryset = self.get_events_queryset(windows).defer('search_vector').annotate(
+            min_price=Min('zones__price'), max_price=Max('zones__price')
+        ).order_by('event_start_datetime')
+        if "zones" in self.get_includes():
+            # The zones of all the events are loaded with a single query
+            queryset = queryset.prefetch_related(Prefetch('zones', queryset=Zone.objects.order_by('id')))
+
+        return queryset
 
     def get_queryset(self):
-        starts_at = self.request.query_params.get("starts_at", None)
-        errored, starts_at_datetime_obj = self._datetime_string_parser(starts_at)
-        if errored:
-            error_message = f"Query param: 'starts_at' not provided or malformed."
-            detail = {"error": {"message": error_message, "code": status.HTTP_400_BAD_REQUEST}, "data": None}
-            raise ParseError(detail, code=status.HTTP_400_BAD_REQUEST)
-
-        ends_at = self.request.query_params.get("ends_at", None)
-        errored, ends_at_datetime_obj = self._datetime_string_parser(ends_at)
-        if errored:
-            error_message = f"Query param: 'ends_at' not provided or malformed."
-            detail = {"error": {"message": error_message, "code": status.HTTP_400_BAD_REQUEST}, "data": None}
-            raise ParseError(detail, code=status.HTTP_400_BAD_REQUEST)
-
-        return self.model.objects.filter(event_start_datetime__gte=starts_at, event_end_datetime__lte=ends_at_datetime_obj)
-
-    @swagger_auto_schema(
-        manual_parameters=[
-            openapi.Parameter('starts_at', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATETIME),
-            openapi.Parameter('ends_at', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATETIME),
-        ],
-        responses={200: openapi.Response(
-            description="List of plans",
-            schema=openapi.Schema(
-                type=openapi.TYPE_OBJECT,
-                properties={
-                    'data': openapi.Schema(
-                        type=openapi.TYPE_OBJECT,
-                        properties={
-                            'events': openapi.Schema(
-                                type=openapi.TYPE_ARRAY,
-                                items=openapi.Schema(
-                                    type=openapi.TYPE_OBJECT,
-                                    properties={
-                                        'id': openapi.Schema(type=openapi.TYPE_STRING),
-                                        'title': openapi.Schema(type=openapi.TYPE_STRING),
-                                        'start_date': openapi.Schema(type=openapi.TYPE_STRING),
-                                        'start_time': openapi.Schema(type=openapi.TYPE_STRING),
-                                        'end_date': openapi.Schema(type=openapi.TYPE_STRING),
-                                        'end_time': openapi.Schema(type=openapi.TYPE_STRING),
-                                        'min_price': openapi.Schema(type=openapi.TYPE_INTEGER),
-                                        'max_price': openapi.Schema(type=openapi.TYPE_INTEGER),
-                                    }
-                                )
-                            )
-                        }
-                    ),
-                    'error': openapi.Schema(type=openapi.TYPE_STRING, nullable=True)
-                }
-            ),
-            examples={
-                "application/json": {
-                    "data": {
-                        "events": [
-                            {
-                                "id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
-                                "title": "string",
-                                "start_date": "2024-04-13",
-                                "start_time": "22:38:19",
-                                "end_date": "2024-04-13",
-                                "end_time": "14:45:15",
-                                "min_price": 0,
-                                "max_price": 0
-                            }
-                        ]
-                    },
-                    "error": None
-                }
-            }
-        ), 400: openapi.Response(
-                description="The request was not correctly formed (missing required parameters, wrong types...)",
-                schema=openapi.Schema(
-                    type=openapi.TYPE_OBJECT,
-                    properties={
-                        'error': openapi.Schema(
-                            type=openapi.TYPE_OBJECT,
-                            properties={
-                                'code': openapi.Schema(type=openapi.TYPE_STRING),
-                                'message': openapi.Schema(type=openapi.TYPE_STRING)
-                            }
-                        ),
-                        'data': openapi.Schema(type=openapi.TYPE_STRING, format="null")
-                    }
-                ),
-                examples={
-                    "application/json": {
-                        "error": {
-                            "code": "string",
-                            "message": "string"
-                        },
-                        "data": None  # Null data
-                    }
-                }
-            ),
-            500: openapi.Response(
-                description="Generic error",
-                schema=openapi.Schema(
-                    type=openapi.TYPE_OBJECT,
-                    properties={
-                        'error': openapi.Schema(
-                            type=openapi.TYPE_OBJECT,
-                            properties={
-                                'code': openapi.Schema(type=openapi.TYPE_STRING),
-                                'message': openapi.Schema(type=openapi.TYPE_STRING)
-                            }
-                        ),
-                        'data': openapi.Schema(type=openapi.TYPE_STRING, format="null")
-                    }
-                ),
-                examples={
-                    "application/json": {
-                        "error": {
-                            "code": "string",
-                            "message": "string"
-                        },
-                        "data": None  # Null data
-                    }
-                }
-            ),
-        }
-    )
+        return self.get_events([self.get_search_window()])
+
+    def get_validators(self, events):
+        """
+        Compute the ETag and Last-Modified validators of the search response
+        without serializing the events.
+
+        Both come from the data version, which changes with every write of the sync, so
+        removals and changes of events leaving the window invalidate them too.
+
+        Args:
+            events: The events returned by get_queryset.
+
+        Returns:
+            tuple: The ETag (str), the last modification datetime of the data (or None) and
+                the number of events.
+        """
+
+        version, last_modified = get_data_version_state()
+        if isinstance(events, list):
+            # Served by the event index
+            count = len(events)
+        else:
+            count = self.get_events_queryset([self.get_search_window()]).count()
+
+        validator = ":".join((
+            version,
+            self.request.get_full_path(),
+            self.request.accepted_renderer.format,
+            str(count),
+        ))
+        etag = f'W/"{hashlib.md5(validator.encode()).hexdigest()}"'
+
+        return etag, last_modified, count
+
+    def _check_results_count(self, count):
+        max_results = settings.EVENTS_SEARCH_MAX_RESULTS
+        if count > max_results:
+            self._raise_parse_error(f"The search matches more than {max_results} events, narrow the window.")
+
+
+    @staticmethod
+    def set_cache_headers(response, etag, last_modified):
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        patch_cache_control(response, public=True, max_age=settings.EVENTS_SEARCH_CACHE_MAX_AGE)
+
+    @swagger_auto_schema(auto_schema=EventsSearchAutoSchema)
     def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
-        response_data = {"data": {"events": response.data}, "error": None}
-        response.data = response_data
+        # The validators aggregate over the window, so they take a slot as the search does
+        with self.search_concurrency_limit():
+            events = self.get_queryset()
+
+            etag, last_modified, count = self.get_validators(events)
+            self._check_results_count(count)
+            last_modified_timestamp = int(last_modified.timestamp()) if last_modified else None
+            not_modified_response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified_timestamp
+            )
+            if not_modified_response is not None:
+                self.set_cache_headers(not_modified_response, etag, last_modified)
+                return not_modified_response
+
+            # Responses are cached already rendered and compressed, so popular windows are
+            # neither serialized nor compressed again until the data changes
+            encoding = get_accepted_encoding(request)
+            self.response_cache_key = f"events_search:{etag}:{encoding}"
+            cached_response = cache.get(self.response_cache_key)
+            if cached_response is not None:
+                content, content_type, content_encoding = cached_response
+                response = HttpResponse(content_type=content_type)
+                set_response_content(response, content, content_encoding)
+                patch_vary_headers(response, ("Accept",))
+                self.set_cache_headers(response, etag, last_modified)
+                return response
+
+            serializer = self.get_serializer(events, many=True)
+            response = Response({"data": {"events": serializer.data}, "error": None})
+        self.set_cache_headers(response, etag, last_modified)
 
         return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        response_cache_key = getattr(self, "response_cache_key", None)
+        if response_cache_key and isinstance(response, Response) and response.status_code == status.HTTP_200_OK:
+            response.render()
+            content = response.content
+            encoding = get_accepted_encoding(request)
+            if encoding is None or len(content) < settings.EVENTS_SEARCH_COMPRESSION_MIN_SIZE:
+                encoding = None
+            else:
+                content = compress(content, encoding)
+
+            set_response_content(response, content, encoding)
+            if len(content) <= settings.EVENTS_SEARCH_RESPONSE_CACHE_MAX_SIZE:
+                self.cache_response(response_cache_key, (content, response["Content-Type"], encoding))
+
+        return response
+
+    @staticmethod
+    def cache_response(key, value):
+        try:
+            cache.set(key, value, timeout=settings.EVENTS_SEARCH_RESPONSE_CACHE_TIMEOUT)
+        except Exception:
+            # The response is served all the same, only not from the cache next time
+            logger.warning("Search response not cached", exc_info=True)
+
+    @swagger_auto_schema(auto_schema=EventsSearchBatchAutoSchema)
+    @action(detail=False, methods=['post'], url_path='batch')
+    def batch(self, request, *args, **kwargs):
+        """
+        Search the events of several windows with a single query of the events of any of them.
+        """
+
+        windows = request.data.get("windows", None) if isinstance(request.data, dict) else None
+        if not isinstance(windows, list) or not windows:
+            self._raise_parse_error("Body param: 'windows' not provided or malformed.")
+        if len(windows) > settings.EVENTS_SEARCH_BATCH_MAX_WINDOWS:
+            self._raise_parse_error(
+                f"Body param: 'windows' can't have more than {settings.EVENTS_SEARCH_BATCH_MAX_WINDOWS} items."
+            )
+
+        search_windows = list()
+        for window in windows:
+            if not isinstance(window, dict):
+                self._raise_parse_error("Body param: 'windows' not provided or malformed.")
+            search_windows.append(
+                self.parse_search_window(window.get("starts_at"), window.get("ends_at"), source="Body param")
+            )
+
+        with self.search_concurrency_limit():
+            events = self.get_events(search_windows)
+            events = list(events[:settings.EVENTS_SEARCH_MAX_RESULTS + 1])
+            self._check_results_count(len(events))
+            starts = [event.event_start_datetime for event in events]
+
+            # Events are sorted by start, each window is a slice of them filtered by end, and
+            # every event is serialized once even if it belongs to several windows
+            serializer = self.get_serializer()
+            serialized_events = dict()
+            results = list()
+            for window, (starts_at, ends_at) in zip(windows, search_windows):
+                window_events = list()
+                for position in range(bisect_left(starts, starts_at), bisect_right(starts, ends_at)):
+                    if events[position].event_end_datetime > ends_at:
+                        continue
+                    if position not in serialized_events:
+                        serialized_events[position] = serializer.to_representation(events[position])
+                    window_events.append(serialized_events[position])
+
+                results.append(
+                    {"starts_at": window["starts_at"], "ends_at": window["ends_at"], "events": window_events}
+                )
+
+        return Response({"data": {"windows": results}, "error": None})
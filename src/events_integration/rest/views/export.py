@@ -0,0 +1,152 @@
+import csv
+import datetime
+import json
+import logging
+from collections import defaultdict
+from contextlib import ExitStack
+from itertools import islice
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Q
+from django.http import StreamingHttpResponse
+from rest_framework import viewsets
+from rest_framework.utils.encoders import JSONEncoder
+
+from events_integration.models import Event, Zone
+from events_integration.rest.utils.renderers import CSVRenderer, NDJSONRenderer
+from events_integration.rest.utils.throttling import EventsExportThrottle
+from .mixins import SearchLimitsMixin, SearchParamsMixin
+
+# Swagger imports
+from drf_yasg.utils import swagger_auto_schema
+from .schemas import EventsExportAutoSchema
+
+logger = logging.getLogger("sync_external_events")
+
+EVENT_FIELDS = (
+    "id", "uuid", "base_event_id", "organizer_company_id", "title", "sell_mode",
+    "event_start_datetime", "event_end_datetime", "sell_from", "sell_to", "sold_out",
+    "modification_datetime",
+)
+ZONE_FIELDS = ("id", "name", "capacity", "price", "numbered", "modification_datetime")
+CSV_HEADER = (
+    ["event_" + field for field in EVENT_FIELDS] + ["zone_" + field for field in ZONE_FIELDS]
+)
+
+
+class Echo:
+    """
+    File-like object returning what is written to it, to stream the csv.writer rows.
+    """
+
+    def write(self, value):
+        return value
+
+
+class ClosingStream:
+    """
+    Streamed content calling on_close when the response is closed, once it is sent or the
+    client went away, even if it was never iterated.
+    """
+
+    def __init__(self, content, on_close):
+        self.content = content
+        self.on_close = on_close
+
+    def __iter__(self):
+        return iter(self.content)
+
+    def close(self):
+        self.on_close()
+
+
+class EventsExportView(SearchLimitsMixin, SearchParamsMixin, viewsets.ViewSet):
+    """
+    Export of the whole catalog of events with their zones, streamed from a server-side
+    cursor so its memory usage doesn't depend on the number of events.
+
+    Each export keeps one of EVENTS_EXPORT_MAX_CONCURRENT slots until it is streamed, and
+    its clients are throttled more strictly than the searches.
+    """
+
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+    throttle_classes = [EventsExportThrottle]
+    concurrency_limit_name = "events_export"
+    max_concurrent_queries_setting = "EVENTS_EXPORT_MAX_CONCURRENT"
+
+    def get_queryset(self):
+        queryset = Event.objects.order_by("id")
+
+        modified_since = self._parse_datetime_query_param("modified_since")
+        if modified_since is not None:
+            queryset = queryset.filter(
+                Q(modification_datetime__gte=modified_since)
+                | Exists(Zone.objects.filter(event=OuterRef("pk"), modification_datetime__gte=modified_since))
+            )
+
+        return queryset
+
+    @staticmethod
+    def iter_events_with_zones(queryset, chunk_size):
+        """
+        Iterate over the events and their zones, loading the zones of each chunk
+        of events with one query.
+
+        Yields:
+            tuple: The event values and the list of its zone values.
+        """
+
+        events = queryset.values_list(*EVENT_FIELDS).iterator(chunk_size=chunk_size)
+        while True:
+            chunk = list(islice(events, chunk_size))
+            if not chunk:
+                return
+
+            zones_by_event_id = defaultdict(list)
+            zones = Zone.objects.filter(event_id__in=[event[0] for event in chunk]).order_by("id")
+            for zone in zones.values_list("event_id", *ZONE_FIELDS):
+                zones_by_event_id[zone[0]].append(zone[1:])
+
+            for event in chunk:
+                yield event, zones_by_event_id[event[0]]
+
+    def iter_ndjson(self, rows):
+        for event, zones in rows:
+            data = dict(zip(EVENT_FIELDS, event))
+            data["zones"] = [dict(zip(ZONE_FIELDS, zone)) for zone in zones]
+            yield json.dumps(data, cls=JSONEncoder) + "\n"
+
+    def iter_csv(self, rows):
+        # One row per zone, events without zones get one row with empty zone columns
+        writer = csv.writer(Echo())
+        yield writer.writerow(CSV_HEADER)
+        empty_zone = [None] * len(ZONE_FIELDS)
+        for event, zones in rows:
+            for zone in zones or [empty_zone]:
+                yield writer.writerow([
+                    value.isoformat() if isinstance(value, datetime.datetime) else value
+                    for value in (*event, *zone)
+                ])
+
+    @swagger_auto_schema(auto_schema=EventsExportAutoSchema)
+    def list(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+
+        # Taken here to answer 429 before the response starts, released when it is closed
+        slot = ExitStack()
+        slot.enter_context(self.search_concurrency_limit())
+
+        rows = self.iter_events_with_zones(queryset, settings.EVENTS_EXPORT_CHUNK_SIZE)
+
+        renderer = request.accepted_renderer
+        if renderer.format == CSVRenderer.format:
+            content = self.iter_csv(rows)
+        else:
+            content = self.iter_ndjson(rows)
+
+        response = StreamingHttpResponse(
+            ClosingStream(content, slot.close), content_type=f"{renderer.media_type}; charset={renderer.charset}"
+        )
+        response["Content-Disposition"] = f'attachment; filename="events.{renderer.format}"'
+
+        return response
@@ -0,0 +1,142 @@
+import datetime
+import random
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+
+from events_integration.rest.utils.profiling import profile
+from events_integration.rest.utils.throttling import EventsSearchThrottle, Throttled, concurrency_limit
+
+
+class SearchParamsMixin:
+    """
+    Parsing of the search parameters shared by the views, raising the errors in
+    the API format.
+    """
+
+    @staticmethod
+    def _datetime_string_parser(datetime_str: str, datetime_parser_mask="%Y-%m-%dT%H:%M:%SZ"):
+        errored = False
+        date_time_obj = None
+        try:
+            date_time_obj = datetime.datetime.strptime(datetime_str, datetime_parser_mask)
+        except:
+            errored = True
+
+        return errored, date_time_obj
+
+    @staticmethod
+    def _raise_parse_error(error_message):
+        detail = {"error": {"message": error_message, "code": status.HTTP_400_BAD_REQUEST}, "data": None}
+        raise ParseError(detail, code=status.HTTP_400_BAD_REQUEST)
+
+    def parse_search_window(self, starts_at, ends_at, source="Query param"):
+        """
+        Parse the bounds of a search window.
+
+        Args:
+            starts_at (str): The start of the window, as "%Y-%m-%dT%H:%M:%SZ".
+            ends_at (str): The end of the window, as "%Y-%m-%dT%H:%M:%SZ".
+            source (str): Where the bounds come from, used in the error messages.
+
+        Returns:
+            tuple: The aware start and end datetimes.
+
+        Raises:
+            ParseError: If a bound is missing or malformed, or the window is too long.
+        """
+
+        errored, starts_at_datetime_obj = self._datetime_string_parser(starts_at)
+        if errored:
+            self._raise_parse_error(f"{source}: 'starts_at' not provided or malformed.")
+
+        errored, ends_at_datetime_obj = self._datetime_string_parser(ends_at)
+        if errored:
+            self._raise_parse_error(f"{source}: 'ends_at' not provided or malformed.")
+
+        starts_at_datetime_obj = timezone.make_aware(starts_at_datetime_obj, timezone.utc)
+        ends_at_datetime_obj = timezone.make_aware(ends_at_datetime_obj, timezone.utc)
+
+        max_window_days = settings.EVENTS_SEARCH_MAX_WINDOW_DAYS
+        if ends_at_datetime_obj - starts_at_datetime_obj > datetime.timedelta(days=max_window_days):
+            self._raise_parse_error(f"{source}: the window can't be longer than {max_window_days} days.")
+
+        return starts_at_datetime_obj, ends_at_datetime_obj
+
+    def get_search_window(self):
+        return self.parse_search_window(
+            self.request.query_params.get("starts_at", None), self.request.query_params.get("ends_at", None)
+        )
+
+    def _parse_query_param(self, name, parser):
+        value = self.request.query_params.get(name, None)
+        if value is None:
+            return None
+
+        try:
+            return parser(value)
+        except (TypeError, ValueError):
+            self._raise_parse_error(f"Query param: '{name}' malformed.")
+
+    @staticmethod
+    def _boolean_parser(value):
+        value = value.lower()
+        if value not in ("true", "false"):
+            raise ValueError(value)
+        return value == "true"
+
+    def _parse_datetime_query_param(self, name):
+        value = self.request.query_params.get(name, None)
+        if value is None:
+            return None
+
+        errored, datetime_obj = self._datetime_string_parser(value)
+        if errored:
+            self._raise_parse_error(f"Query param: '{name}' malformed.")
+
+        return timezone.make_aware(datetime_obj, timezone.utc)
+
+
+class SearchLimitsMixin:
+    """
+    Per client throttling and cap of concurrent database queries of the search views, the
+    limit shared by the views with the same concurrency_limit_name and set by the setting
+    named by max_concurrent_queries_setting.
+    """
+
+    throttle_classes = [EventsSearchThrottle]
+    concurrency_limit_name = "events_search"
+    max_concurrent_queries_setting = "EVENTS_SEARCH_MAX_CONCURRENT_QUERIES"
+
+    def search_concurrency_limit(self):
+        return concurrency_limit(self.concurrency_limit_name, getattr(settings, self.max_concurrent_queries_setting))
+
+    def throttled(self, request, wait):
+        raise Throttled(wait or 1)
+
+
+class SampledProfilingMixin:
+    """
+    Profile a sample of the requests of the view, the ratio set by the setting named by
+    profile_sample_rate_setting (0 disables it), to PROFILE_DIR.
+    """
+
+    profile_sample_rate_setting = None
+
+    def dispatch(self, request, *args, **kwargs):
+        sample_rate = getattr(settings, self.profile_sample_rate_setting)
+        if not sample_rate or random.random() >= sample_rate:
+            return super().dispatch(request, *args, **kwargs)
+
+        metadata = {"method": request.method, "path": request.get_full_path()}
+        # Not profiled, rather than waiting, while another thread of the worker is
+        with profile(
+            self.__class__.__name__, settings.PROFILE_DIR, metadata, max_count=settings.PROFILE_MAX_COUNT,
+            blocking=False,
+        ):
+            response = super().dispatch(request, *args, **kwargs)
+            metadata["status_code"] = response.status_code
+
+        return response
@@ -0,0 +1,318 @@
+"""
+Swagger documentation of the events views.
+
+The schemas are only needed to generate the documentation, so they are built the
+first time it is requested instead of when the views are imported.
+"""
+from functools import lru_cache
+
+from drf_yasg import openapi
+from drf_yasg.inspectors import SwaggerAutoSchema
+
+
+def _error_response(description):
+    return openapi.Response(
+        description=description,
+        schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'error': openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        'code': openapi.Schema(type=openapi.TYPE_STRING),
+                        'message': openapi.Schema(type=openapi.TYPE_STRING)
+                    }
+                ),
+                'data': openapi.Schema(type=openapi.TYPE_STRING, format="null")
+            }
+        ),
+        examples={
+            "application/json": {
+                "error": {
+                    "code": "string",
+                    "message": "string"
+                },
+                "data": None  # Null data
+            }
+        }
+    )
+
+
+@lru_cache(maxsize=None)
+def get_events_search_overrides():
+    return dict(
+        manual_parameters=[
+            openapi.Parameter('starts_at', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATETIME),
+            openapi.Parameter('ends_at', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATETIME),
+            openapi.Parameter(
+                'q', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                description="Full-text search on the title (web search syntax: words, \"phrases\", or, -excluded)"
+            ),
+            openapi.Parameter(
+                'min_price', openapi.IN_QUERY, type=openapi.TYPE_NUMBER,
+                description="Only events with a zone priced at least this amount"
+            ),
+            openapi.Parameter(
+                'max_price', openapi.IN_QUERY, type=openapi.TYPE_NUMBER,
+                description="Only events with a zone priced at most this amount"
+            ),
+            openapi.Parameter('sold_out', openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN),
+            openapi.Parameter(
+                'numbered', openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN,
+                description="Only events with a zone with (or without) numbered seats"
+            ),
+            openapi.Parameter(
+                'min_capacity', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                description="Only events with a zone with at least this capacity"
+            ),
+            openapi.Parameter(
+                'include', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=['zones'],
+                description="Add the zones of each event to the response"
+            ),
+        ],
+        responses={
+            200: openapi.Response(
+                description="List of plans",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        'data': openapi.Schema(
+                            type=openapi.TYPE_OBJECT,
+                            properties={
+                                'events': openapi.Schema(
+                                    type=openapi.TYPE_ARRAY,
+                                    items=openapi.Schema(
+                                        type=openapi.TYPE_OBJECT,
+                                        properties={
+                                            'id': openapi.Schema(type=openapi.TYPE_STRING),
+                                            'title': openapi.Schema(type=openapi.TYPE_STRING),
+                                            'start_date': openapi.Schema(type=openapi.TYPE_STRING),
+                                            'start_time': openapi.Schema(type=openapi.TYPE_STRING),
+                                            'end_date': openapi.Schema(type=openapi.TYPE_STRING),
+                                            'end_time': openapi.Schema(type=openapi.TYPE_STRING),
+                                            'min_price': openapi.Schema(type=openapi.TYPE_INTEGER),
+                                            'max_price': openapi.Schema(type=openapi.TYPE_INTEGER),
+                                        }
+                                    )
+                                )
+                            }
+                        ),
+                        'error': openapi.Schema(type=openapi.TYPE_STRING, nullable=True)
+                    }
+                ),
+                examples={
+                    "application/json": {
+                        "data": {
+                            "events": [
+                                {
+                                    "id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+                                    "title": "string",
+                                    "start_date": "2024-04-13",
+                                    "start_time": "22:38:19",
+                                    "end_date": "2024-04-13",
+                                    "end_time": "14:45:15",
+                                    "min_price": 0,
+                                    "max_price": 0
+                                }
+                            ]
+                        },
+                        "error": None
+                    }
+                }
+            ),
+            400: _error_response(
+                "The request was not correctly formed (missing required parameters, wrong types...)"
+            ),
+            500: _error_response("Generic error"),
+        }
+    )
+
+
+@lru_cache(maxsize=None)
+def get_events_search_batch_overrides():
+    return dict(
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=['windows'],
+            properties={
+                'windows': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        required=['starts_at', 'ends_at'],
+                        properties={
+                            'starts_at': openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_DATETIME),
+                            'ends_at': openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_DATETIME),
+                        }
+                    )
+                )
+            }
+        ),
+        responses={
+            200: openapi.Response(
+                description="List of plans of each window, in the order of the request",
+                examples={
+                    "application/json": {
+                        "data": {
+                            "windows": [
+                                {
+                                    "starts_at": "2024-04-13T00:00:00Z",
+                                    "ends_at": "2024-04-14T00:00:00Z",
+                                    "events": [
+                                        {
+                                            "id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+                                            "title": "string",
+                                            "start_date": "2024-04-13",
+                                            "start_time": "22:38:19",
+                                            "end_date": "2024-04-13",
+                                            "end_time": "23:45:15",
+                                            "min_price": 0,
+                                            "max_price": 0
+                                        }
+                                    ]
+                                }
+                            ]
+                        },
+                        "error": None
+                    }
+                }
+            ),
+            400: _error_response(
+                "The request was not correctly formed (missing required parameters, wrong types...)"
+            ),
+        }
+    )
+
+
+@lru_cache(maxsize=None)
+def get_events_export_overrides():
+    return dict(
+        manual_parameters=[
+            openapi.Parameter(
+                'format', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=['ndjson', 'csv'],
+                description="Export format, NDJSON (one event with its zones per line) by default"
+            ),
+            openapi.Parameter(
+                'modified_since', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATETIME,
+                description="Only events modified (or with zones modified) since this datetime"
+            ),
+        ],
+        responses={
+            200: openapi.Response(description="Events with their zones, streamed"),
+            400: _error_response(
+                "The request was not correctly formed (missing required parameters, wrong types...)"
+            ),
+        }
+    )
+
+
+@lru_cache(maxsize=None)
+def get_zones_search_overrides():
+    return dict(
+        manual_parameters=[
+            openapi.Parameter('starts_at', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATETIME),
+            openapi.Parameter('ends_at', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATETIME),
+        ],
+        responses={
+            200: openapi.Response(
+                description="List of zones of the plans",
+                examples={
+                    "application/json": {
+                        "data": {
+                            "zones": [
+                                {
+                                    "id": 1,
+                                    "event": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+                                    "name": "string",
+                                    "capacity": 0,
+                                    "price": 0,
+                                    "numbered": True
+                                }
+                            ]
+                        },
+                        "error": None
+                    }
+                }
+            ),
+            400: _error_response(
+                "The request was not correctly formed (missing required parameters, wrong types...)"
+            ),
+        }
+    )
+
+
+@lru_cache(maxsize=None)
+def get_changes_overrides():
+    return dict(
+        manual_parameters=[
+            openapi.Parameter(
+                'since', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                description="Only the changes after this sequence, the next of the previous response (0 by default)"
+            ),
+            openapi.Parameter(
+                'limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                description="Maximum number of changes returned"
+            ),
+        ],
+        responses={
+            200: openapi.Response(
+                description="Changes of the events and zones, in the order they were made",
+                examples={
+                    "application/json": {
+                        "data": {
+                            "changes": [
+                                {
+                                    "sequence": 1,
+                                    "entity": "zone",
+                                    "action": "updated",
+                                    "event": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+                                    "zone": 1,
+                                    "changes": {"price": [20.0, 25.0]},
+                                    "creation_datetime": "2024-04-13T22:38:19Z"
+                                }
+                            ],
+                            "next": 1,
+                            "has_more": False
+                        },
+                        "error": None
+                    }
+                }
+            ),
+            400: _error_response(
+                "The request was not correctly formed (missing required parameters, wrong types...)"
+            ),
+        }
+    )
+
+
+class LazySwaggerAutoSchema(SwaggerAutoSchema):
+    """
+    SwaggerAutoSchema taking the swagger_auto_schema overrides from get_overrides,
+    called when the documentation is generated.
+    """
+
+    get_overrides = None
+
+    def __init__(self, view, path, method, components, request, overrides, operation_keys=None):
+        overrides = {**self.get_overrides(), **overrides}
+        super().__init__(view, path, method, components, request, overrides, operation_keys)
+
+
+class EventsSearchAutoSchema(LazySwaggerAutoSchema):
+    get_overrides = staticmethod(get_events_search_overrides)
+
+
+class EventsSearchBatchAutoSchema(LazySwaggerAutoSchema):
+    get_overrides = staticmethod(get_events_search_batch_overrides)
+
+
+class EventsExportAutoSchema(LazySwaggerAutoSchema):
+    get_overrides = staticmethod(get_events_export_overrides)
+
+
+class ZonesSearchAutoSchema(LazySwaggerAutoSchema):
+    get_overrides = staticmethod(get_zones_search_overrides)
+
+
+class ChangesAutoSchema(LazySwaggerAutoSchema):
+    get_overrides = staticmethod(get_changes_overrides)
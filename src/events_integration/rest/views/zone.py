@@ -0,0 +1,43 @@
+import logging
+
+from django.conf import settings
+from rest_framework import viewsets, mixins
+from rest_framework.response import Response
+
+from events_integration.models import Zone
+from events_integration.rest.serializers.zone import ZoneSerializer
+from .mixins import SearchLimitsMixin, SearchParamsMixin
+
+# Swagger imports
+from drf_yasg.utils import swagger_auto_schema
+from .schemas import ZonesSearchAutoSchema
+
+logger = logging.getLogger("sync_external_events")
+
+
+class ZonesView(SearchLimitsMixin, SearchParamsMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    model = Zone
+    serializer_class = ZoneSerializer
+
+    def get_queryset(self):
+        starts_at, ends_at = self.get_search_window()
+
+        # The event is joined in the same query for its public id
+        return self.model.objects.filter(
+            event__event_start_datetime__gte=starts_at, event__event_end_datetime__lte=ends_at
+        ).select_related('event').only(
+            'id', 'name', 'capacity', 'price', 'numbered', 'event', 'event__uuid'
+        ).order_by('event__event_start_datetime', 'id')
+
+    @swagger_auto_schema(auto_schema=ZonesSearchAutoSchema)
+    def list(self, request, *args, **kwargs):
+        max_results = settings.EVENTS_SEARCH_MAX_RESULTS
+        with self.search_concurrency_limit():
+            zones = list(self.get_queryset()[:max_results + 1])
+            if len(zones) > max_results:
+                self._raise_parse_error(f"The search matches more than {max_results} zones, narrow the window.")
+
+            serializer = self.get_serializer(zones, many=True)
+            response_data = {"data": {"zones": serializer.data}, "error": None}
+
+        return Response(response_data)
@@ -0,0 +1,174 @@
+import io
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from events_integration.models import Change, Event, Zone
+from events_integration.rest.utils.sync_external_events import SyncExternalEvents
+
+# First occurrences of events 1 and 2
+FIRST_FEED = [
+    (1, "Concert", [(10, 100), (11, 50)]),
+    (2, "Play", [(20, 200)]),
+]
+SECOND_FEED = [
+    # Event unchanged, a zone updated and a zone removed
+    (1, "Concert", [(10, 80)]),
+    # Event updated, zone unchanged
+    (2, "Play, new date", [(20, 200)]),
+    # Created
+    (3, "Opera", [(30, 300)]),
+    # Duplicated event, dropped with its zones
+    (3, "Duplicate", [(31, 10)]),
+    # Created, but a duplicated zone
+    (4, "Ballet", [(30, 10), (40, 400)]),
+]
+
+
+def make_feed(base_events):
+    """
+    Build a provider feed of one event per base event.
+
+    Args:
+        base_events (List): The events as (event_id, title, zones) tuples, the zones as
+            (zone_id, capacity) tuples.
+
+    Returns:
+        bytes: The XML of the feed.
+    """
+
+    parts = ['<?xml version="1.0" encoding="UTF-8"?><eventList version="1.0"><output>']
+    for event_id, title, zones in base_events:
+        parts.append(
+            f'<base_event base_event_id="{event_id}" sell_mode="online" title="{title}">'
+            f'<event event_start_date="2030-06-01T20:00:00" event_end_date="2030-06-01T22:00:00" '
+            f'event_id="{event_id}" sell_from="2030-01-01T00:00:00" sell_to="2030-06-01T00:00:00" '
+            f'sold_out="false">'
+        )
+        parts.extend(
+            f'<zone zone_id="{zone_id}" capacity="{capacity}" price="20.00" name="Zone {zone_id}" numbered="true" />'
+            for zone_id, capacity in zones
+        )
+        parts.append('</event></base_event>')
+    parts.append('</output></eventList>')
+
+    return "".join(parts).encode()
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    EVENTS_SEARCH_THROTTLE_RATE=0,
+)
+class ChangeLogTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    @staticmethod
+    def sync(base_events):
+        """
+        Apply a feed, one base event per chunk, so duplicates are dropped across chunks.
+
+        Returns:
+            tuple: The sync, and the changes it logged as (entity, entity_id, action) tuples.
+        """
+
+        last_change_id = Change.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        sync = SyncExternalEvents("test", chunk_size=1, workers=0, provider="test")
+        sync.payload = io.BytesIO(make_feed(base_events))
+        sync.apply_payload()
+
+        return sync, list(
+            Change.objects.filter(id__gt=last_change_id).order_by('id').values_list('entity', 'entity_id', 'action')
+        )
+
+    def test_first_sync_logs_creations(self):
+        _, changes = self.sync(FIRST_FEED)
+
+        self.assertEqual(changes, [
+            (Change.ENTITY_EVENT, 1, Change.ACTION_CREATED),
+            (Change.ENTITY_ZONE, 10, Change.ACTION_CREATED),
+            (Change.ENTITY_ZONE, 11, Change.ACTION_CREATED),
+            (Change.ENTITY_EVENT, 2, Change.ACTION_CREATED),
+            (Change.ENTITY_ZONE, 20, Change.ACTION_CREATED),
+        ])
+
+    def test_second_sync_logs_only_the_differences_in_order(self):
+        self.sync(FIRST_FEED)
+        modification_datetime = Event.objects.get(id=1).modification_datetime
+
+        with self.assertLogs('sync_external_events', 'WARNING') as logs:
+            sync, changes = self.sync(SECOND_FEED)
+
+        self.assertEqual(changes, [
+            (Change.ENTITY_ZONE, 10, Change.ACTION_UPDATED),
+            (Change.ENTITY_ZONE, 11, Change.ACTION_REMOVED),
+            (Change.ENTITY_EVENT, 2, Change.ACTION_UPDATED),
+            (Change.ENTITY_EVENT, 3, Change.ACTION_CREATED),
+            (Change.ENTITY_ZONE, 30, Change.ACTION_CREATED),
+            (Change.ENTITY_EVENT, 4, Change.ACTION_CREATED),
+            (Change.ENTITY_ZONE, 40, Change.ACTION_CREATED),
+        ])
+        # Event 3 again with its zone, and zone 30 again
+        self.assertEqual(sync.duplicate_count, 3)
+        self.assertIn("3 event and zone rows of test skipped", logs.output[0])
+
+        logged = {
+            (change.entity, change.entity_id): change
+            for change in Change.objects.filter(action__in=[Change.ACTION_UPDATED, Change.ACTION_REMOVED])
+        }
+        self.assertEqual(logged[Change.ENTITY_ZONE, 10].changes, {"capacity": [100, 80]})
+        self.assertEqual(logged[Change.ENTITY_ZONE, 11].changes["capacity"], [50, None])
+        self.assertEqual(logged[Change.ENTITY_EVENT, 2].changes, {"title": ["Play", "Play, new date"]})
+        event_uuids = dict(Event.objects.values_list('id', 'uuid'))
+        self.assertEqual(logged[Change.ENTITY_ZONE, 11].event_uuid, event_uuids[1])
+
+        # The first occurrence of the duplicated ids is kept
+        self.assertEqual(Event.objects.get(id=3).title, "Opera")
+        self.assertEqual(Zone.objects.get(id=30).event_id, 3)
+        self.assertFalse(Zone.objects.filter(id__in=[11, 31]).exists())
+        # Touched by the removal of its zone, for the export of the modified events
+        self.assertGreater(Event.objects.get(id=1).modification_datetime, modification_datetime)
+
+    def test_unchanged_feed_logs_nothing(self):
+        self.sync(FIRST_FEED)
+
+        _, changes = self.sync(FIRST_FEED)
+
+        self.assertEqual(changes, [])
+
+    def test_changes_are_paged_with_the_cursor(self):
+        self.sync(FIRST_FEED)
+        with self.assertLogs('sync_external_events', 'WARNING'):
+            self.sync(SECOND_FEED)
+        change_ids = list(Change.objects.order_by('id').values_list('id', flat=True))
+        client = APIClient()
+
+        since, pages = 0, []
+        while True:
+            response = client.get('/api/changes/', {'since': since, 'limit': 5})
+            self.assertEqual(response.status_code, 200)
+            data = response.json()["data"]
+            pages.append([change["sequence"] for change in data["changes"]])
+            since = data["next"]
+            if not data["has_more"]:
+                break
+
+        self.assertEqual(pages, [change_ids[:5], change_ids[5:10], change_ids[10:]])
+        self.assertEqual(since, change_ids[-1])
+
+        # Nothing new, the cursor stays
+        data = client.get('/api/changes/', {'since': since}).json()["data"]
+        self.assertEqual(data, {"changes": [], "next": since, "has_more": False})
+
+    def test_zone_changes_refer_to_their_event(self):
+        self.sync(FIRST_FEED)
+
+        changes = APIClient().get('/api/changes/').json()["data"]["changes"]
+
+        event_uuid = str(Event.objects.get(id=1).uuid)
+        self.assertEqual(
+            [(change["event"], change["zone"]) for change in changes[:3]],
+            [(event_uuid, None), (event_uuid, 10), (event_uuid, 11)],
+        )
@@ -0,0 +1,104 @@
+import datetime
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from events_integration.models import Event, Zone
+from events_integration.rest.utils.data_version import get_data_version_state
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES, EVENTS_SEARCH_THROTTLE_RATE=0, EVENT_INDEX_ENABLED=False)
+class EventsSearchIncludeZonesTests(TestCase):
+    # The search window, its count for the validators, the events and their zones, and the
+    # advisory lock of the concurrency limit and its release
+    expected_query_count = 5
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    @staticmethod
+    def create_events(starts_at, count, zone_count=3):
+        events = Event.objects.bulk_create([
+            Event(
+                base_event_id=number, title=f"Event {number}", sell_mode="online",
+                event_start_datetime=starts_at + datetime.timedelta(hours=number),
+                event_end_datetime=starts_at + datetime.timedelta(hours=number + 1),
+                sell_from=starts_at - datetime.timedelta(days=30), sell_to=starts_at, sold_out=False,
+            )
+            for number in range(count)
+        ])
+        Zone.objects.bulk_create([
+            Zone(event=event, name=f"Zone {number}", capacity=100, price=10.0 + number, numbered=False)
+            for event in events for number in range(zone_count)
+        ])
+
+    def search(self, starts_at, days):
+        return self.client.get('/api/events/search/', {
+            'starts_at': starts_at.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'ends_at': (starts_at + datetime.timedelta(days=days)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'include': 'zones',
+        })
+
+    def test_query_count_does_not_depend_on_the_number_of_events(self):
+        small_window = timezone.make_aware(datetime.datetime(2030, 1, 1), timezone.utc)
+        large_window = timezone.make_aware(datetime.datetime(2030, 3, 1), timezone.utc)
+        self.create_events(small_window, 2)
+        self.create_events(large_window, 200)
+        # Cached once per data version, not per search
+        get_data_version_state()
+
+        for starts_at, count in ((small_window, 2), (large_window, 200)):
+            with self.subTest(count=count), self.assertNumQueries(self.expected_query_count):
+                response = self.search(starts_at, days=10)
+
+            self.assertEqual(response.status_code, 200)
+            events = response.json()["data"]["events"]
+            self.assertEqual(len(events), count)
+            self.assertTrue(all(len(event["zones"]) == 3 for event in events))
+
+
+@override_settings(CACHES=LOCMEM_CACHES, EVENTS_SEARCH_THROTTLE_RATE=0, EVENT_INDEX_ENABLED=False)
+class EventsSearchResponseCacheTests(TestCase):
+    starts_at = timezone.make_aware(datetime.datetime(2030, 1, 1), timezone.utc)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        EventsSearchIncludeZonesTests.create_events(self.starts_at, 20)
+
+    def search(self):
+        return self.client.get('/api/events/search/', {
+            'starts_at': self.starts_at.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'ends_at': (self.starts_at + datetime.timedelta(days=10)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        }, HTTP_ACCEPT_ENCODING='identity')
+
+    def get_cached_responses(self):
+        return [key for key in cache._cache if 'events_search:' in key]
+
+    def test_response_is_cached(self):
+        response = self.search()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.get_cached_responses()), 1)
+
+    def test_larger_response_is_not_cached(self):
+        with override_settings(EVENTS_SEARCH_RESPONSE_CACHE_MAX_SIZE=1000):
+            response = self.search()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(len(response.content), 1000)
+        self.assertEqual(self.get_cached_responses(), [])
+
+    def test_failed_cache_write_does_not_fail_the_response(self):
+        with mock.patch.object(cache, 'set', side_effect=Exception("Item too large")), \
+                self.assertLogs('sync_external_events', 'WARNING'):
+            response = self.search()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["data"]["events"]), 20)
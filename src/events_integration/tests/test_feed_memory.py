@@ -0,0 +1,93 @@
+import json
+import resource
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase, tag
+
+from events_integration.rest.utils.feed_rows import iter_base_event_chunks
+from events_integration.rest.utils.feed_validation import inspect_feed
+from events_integration.rest.utils.sync_external_events import SyncExternalEvents
+from events_integration.rest.utils.synthetic_feed import SyntheticFeed
+
+
+def get_peak_rss():
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure_feed_memory(event_count, chunk_size):
+    """
+    Validate and split a synthetic feed as the sync does, and print the event and chunk counts
+    with the growth of the peak RSS in MB, as JSON.
+    """
+
+    base_rss = get_peak_rss()
+    event_count, _ = inspect_feed(SyntheticFeed(event_count))
+    chunk_count = sum(1 for _ in iter_base_event_chunks(SyntheticFeed(event_count), chunk_size))
+    rss_increase = get_peak_rss() - base_rss
+    print(json.dumps({"event_count": event_count, "chunk_count": chunk_count, "rss_increase": rss_increase}))
+
+
+class DatabaseFreeSyncExternalEvents(SyncExternalEvents):
+    """
+    Sync whose rows are counted instead of being saved, every event as changed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.saved_event_count = 0
+
+    def save_rows(self, event_rows, zone_rows):
+        self.saved_event_count += len(event_rows)
+        return set(event_rows)
+
+
+def measure_sync_memory(event_count, chunk_size):
+    """
+    Apply a synthetic feed with the default pipeline of the sync, parsed in this process,
+    without the database writes, and print the number of events saved with the growth of the
+    peak RSS in MB, as JSON.
+    """
+
+    sync = DatabaseFreeSyncExternalEvents("synthetic", chunk_size=chunk_size, workers=0, provider="synthetic")
+    sync.payload = SyntheticFeed(event_count)
+    base_rss = get_peak_rss()
+    sync.apply_payload()
+    rss_increase = get_peak_rss() - base_rss
+    print(json.dumps({"event_count": sync.saved_event_count, "rss_increase": rss_increase}))
+
+
+@tag('slow')
+class FeedMemoryTests(SimpleTestCase):
+    event_count = 1000000
+    chunk_size = 1000
+    # Ceiling of the growth of the peak RSS while the feed is validated, split or synced, in MB
+    max_rss_increase = 32
+
+    def measure(self, function_name):
+        # In a fresh process, the peak RSS of this one is already set by the other tests
+        result = subprocess.run(
+            [
+                sys.executable, "-c",
+                "import django; django.setup(); "
+                f"from events_integration.tests.test_feed_memory import {function_name}; "
+                f"{function_name}({self.event_count}, {self.chunk_size})",
+            ],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        )
+        return json.loads(result.stdout)
+
+    def test_peak_rss_does_not_grow_with_the_feed(self):
+        measures = self.measure("measure_feed_memory")
+
+        self.assertEqual(measures["event_count"], self.event_count)
+        self.assertEqual(measures["chunk_count"], self.event_count // self.chunk_size)
+        self.assertLess(measures["rss_increase"], self.max_rss_increase)
+
+    def test_peak_rss_of_the_sync_does_not_grow_with_the_feed(self):
+        measures = self.measure("measure_sync_memory")
+
+        self.assertEqual(measures["event_count"], self.event_count)
+        self.assertLess(measures["rss_increase"], self.max_rss_increase)
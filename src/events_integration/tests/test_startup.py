@@ -0,0 +1,65 @@
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+# "import time: self [us] | cumulative | imported package", nested imports indented by 2 per level
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|( +)(\S+)$")
+
+
+def get_import_times(command):
+    """
+    Run a manage.py command with python -X importtime.
+
+    Args:
+        command (List[str]): The arguments of manage.py.
+
+    Returns:
+        tuple: The names of the imported modules and the total import time in milliseconds.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "manage.py", *command],
+        cwd=settings.BASE_DIR, capture_output=True, text=True,
+    )
+    if result.returncode:
+        raise AssertionError(f"manage.py {' '.join(command)} failed:\n{result.stderr[-2000:]}")
+
+    modules = []
+    total_time = 0
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match is None:
+            continue
+        cumulative_time, indent, module = match.groups()
+        modules.append(module)
+        if len(indent) == 1:
+            # Top-level imports, their cumulative times include the nested ones
+            total_time += int(cumulative_time)
+
+    return modules, total_time / 1000
+
+
+class SyncCommandStartupTests(SimpleTestCase):
+    command = ["help", "sync_external_provider", "--settings=config.settings_sync"]
+    # The web stack isn't needed by the sync, and requests only when it fetches
+    forbidden_packages = ("rest_framework", "drf_yasg", "django.contrib.admin", "requests")
+    # Total import time of the command, in ms (about 300 ms measured, 400 ms with the full settings)
+    import_time_budget = 750
+
+    def test_sync_command_doesnt_import_the_web_stack(self):
+        modules, _ = get_import_times(self.command)
+
+        imported = sorted(
+            module for module in modules
+            if any(module == package or module.startswith(f"{package}.") for package in self.forbidden_packages)
+        )
+        self.assertIn("events_integration.rest.utils.sync_external_events", modules)
+        self.assertEqual(imported, [])
+
+    def test_sync_command_import_time_budget(self):
+        _, total_time = get_import_times(self.command)
+
+        self.assertLess(total_time, self.import_time_budget)
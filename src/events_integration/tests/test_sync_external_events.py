@@ -0,0 +1,189 @@
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from events_integration.models import Event, ProviderSyncState, Zone
+from events_integration.rest.utils.sync_external_events import (
+    InvalidPayload, ReplaySyncExternalEvents, SyncExternalEvents,
+)
+from events_integration.rest.utils.synthetic_feed import SyntheticFeed
+
+FEED = (
+    b'<?xml version="1.0" encoding="UTF-8"?><eventList version="1.0"><output>'
+    b'<base_event base_event_id="1" sell_mode="online" title="Concert">'
+    b'<event event_start_date="2030-06-01T20:00:00" event_end_date="2030-06-01T22:00:00" event_id="1" '
+    b'sell_from="2030-01-01T00:00:00" sell_to="2030-06-01T00:00:00" sold_out="false">'
+    b'<zone zone_id="10" capacity="100" price="20.00" name="A" numbered="true" />'
+    b'</event></base_event>'
+    b'</output></eventList>'
+)
+
+
+class StubProviderHandler(BaseHTTPRequestHandler):
+    """
+    Answers with the status, body and Content-Length set on the server, closing the
+    connection after the body, so a Content-Length larger than the body truncates it.
+    """
+
+    def do_GET(self):
+        self.server.request_count += 1
+        status, body, content_length = self.server.response
+        self.send_response(status)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(body) if content_length is None else content_length))
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    SYNC_PARSE_WORKERS=0, SYNC_CIRCUIT_BREAKER_THRESHOLD=3, SYNC_REQUEST_TIMEOUT=5,
+)
+class SyncExternalEventsFetchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubProviderHandler)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+        cls.api_path = f"http://127.0.0.1:{cls.server.server_port}/api/events"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.server.request_count = 0
+        quarantine_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(quarantine_dir.cleanup)
+        self.quarantine_dir = quarantine_dir.name
+        settings_override = override_settings(SYNC_QUARANTINE_DIR=self.quarantine_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def respond(self, status, body=b"", content_length=None):
+        self.server.response = (status, body, content_length)
+
+    def sync(self):
+        SyncExternalEvents(self.api_path).start()
+
+    def test_valid_feed_is_applied(self):
+        self.respond(200, FEED)
+
+        self.sync()
+
+        self.assertEqual(Event.objects.get().title, "Concert")
+        self.assertEqual(Zone.objects.get().capacity, 100)
+        self.assertEqual(ProviderSyncState.objects.get().consecutive_failures, 0)
+
+    def test_truncated_response_is_not_applied(self):
+        # Well-formed up to where it is cut, only its Content-Length tells it is truncated
+        self.respond(200, FEED, content_length=len(FEED) + 1024)
+
+        with self.assertRaises(RuntimeError) as context:
+            self.sync()
+
+        # Rejected by the fetch, before the validation
+        self.assertNotIsInstance(context.exception, InvalidPayload)
+        self.assertFalse(Event.objects.exists())
+        self.assertEqual(ProviderSyncState.objects.get().consecutive_failures, 1)
+
+    def test_empty_response_is_quarantined(self):
+        self.respond(200, b"")
+
+        with self.assertRaises(InvalidPayload):
+            self.sync()
+
+        self.assertFalse(Event.objects.exists())
+        self.assertEqual(ProviderSyncState.objects.get().consecutive_failures, 1)
+        self.assertTrue(os.listdir(self.quarantine_dir))
+
+    def test_server_error_is_not_applied(self):
+        self.respond(503, b"Service Unavailable")
+
+        with self.assertRaises(RuntimeError):
+            self.sync()
+
+        self.assertFalse(Event.objects.exists())
+        self.assertEqual(ProviderSyncState.objects.get().consecutive_failures, 1)
+
+    def test_circuit_opens_after_consecutive_failures(self):
+        self.respond(500, b"Internal Server Error")
+        for _ in range(3):
+            with self.assertRaises(RuntimeError):
+                self.sync()
+
+        state = ProviderSyncState.objects.get()
+        self.assertEqual(state.consecutive_failures, 3)
+        self.assertIsNotNone(state.opened_until)
+
+        # Not fetched while the circuit is open, even once the provider is back
+        self.respond(200, FEED)
+        self.sync()
+
+        self.assertEqual(self.server.request_count, 3)
+        self.assertFalse(Event.objects.exists())
+
+    def assert_quarantined(self, reason):
+        file_names = sorted(os.listdir(self.quarantine_dir))
+        self.assertEqual([os.path.splitext(file_name)[1] for file_name in file_names], [".json", ".xml"])
+        with open(os.path.join(self.quarantine_dir, file_names[0])) as metadata_file:
+            self.assertIn(reason, json.load(metadata_file)["reason"])
+
+    def test_much_smaller_feed_is_quarantined(self):
+        self.respond(200, SyntheticFeed(4).read())
+        self.sync()
+        titles = dict(Event.objects.values_list("id", "title"))
+
+        # 1 of the 4 base events of the last sync, under SYNC_MIN_EVENT_COUNT_RATIO
+        self.respond(200, SyntheticFeed(1).read().replace(b'title="Event 1"', b'title="Changed"'))
+        with self.assertRaises(InvalidPayload), self.assertLogs("sync_external_events", "ERROR"):
+            self.sync()
+
+        self.assert_quarantined("less than 50% of the 4 of the last sync")
+        self.assertEqual(dict(Event.objects.values_list("id", "title")), titles)
+        state = ProviderSyncState.objects.get()
+        self.assertEqual(state.consecutive_failures, 1)
+        self.assertEqual(state.last_event_count, 4)
+
+    def test_quarantined_smaller_feed_can_be_replayed(self):
+        self.respond(200, SyntheticFeed(4).read())
+        self.sync()
+        self.respond(200, SyntheticFeed(1).read().replace(b'title="Event 1"', b'title="Changed"'))
+        with self.assertRaises(InvalidPayload), self.assertLogs("sync_external_events", "ERROR"):
+            self.sync()
+        payload_path = next(
+            os.path.join(self.quarantine_dir, file_name)
+            for file_name in os.listdir(self.quarantine_dir) if file_name.endswith(".xml")
+        )
+
+        ReplaySyncExternalEvents(payload_path).start()
+
+        self.assertEqual(Event.objects.get(id=1).title, "Changed")
+        # The state of the provider is left as it was
+        state = ProviderSyncState.objects.get()
+        self.assertEqual(state.consecutive_failures, 1)
+        self.assertEqual(state.last_event_count, 4)
+
+    def test_feed_with_too_many_invalid_elements_is_quarantined(self):
+        # The zones lose their required capacity
+        self.respond(200, SyntheticFeed(4).read().replace(b'capacity=', b'seats='))
+
+        with self.assertRaises(InvalidPayload), self.assertLogs("sync_external_events", "ERROR"):
+            self.sync()
+
+        self.assert_quarantined("8 elements missing required attributes for 4 base events")
+        self.assertFalse(Event.objects.exists())
+        self.assertEqual(ProviderSyncState.objects.get().consecutive_failures, 1)
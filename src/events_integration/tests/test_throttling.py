@@ -0,0 +1,65 @@
+import types
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from events_integration.rest.utils import throttling
+from events_integration.rest.utils.throttling import EventsSearchThrottle
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+# Windows of 10 seconds
+@override_settings(CACHES=LOCMEM_CACHES, EVENTS_SEARCH_THROTTLE_RATE=1, EVENTS_SEARCH_THROTTLE_BURST=10)
+class SlidingWindowThrottleTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get('/api/events/search/')
+
+    def send(self, count, at):
+        """
+        Send requests at a timestamp, and get how many are allowed and the wait of the last one.
+        """
+
+        with mock.patch.object(throttling, 'time', types.SimpleNamespace(time=lambda: at)):
+            throttles = [EventsSearchThrottle() for _ in range(count)]
+            allowed = sum(throttle.allow_request(self.request, None) for throttle in throttles)
+
+        return allowed, throttles[-1].wait()
+
+    def test_burst_is_allowed_at_once(self):
+        allowed, wait = self.send(11, at=1000.0)
+
+        self.assertEqual(allowed, 10)
+        self.assertGreater(wait, 0)
+
+    def test_burst_is_not_doubled_across_window_boundary(self):
+        self.send(10, at=1009.9)
+        # A fixed window counter would allow 10 more
+        allowed, wait = self.send(10, at=1010.1)
+
+        self.assertEqual(allowed, 0)
+        self.assertAlmostEqual(wait, 0.9)
+
+    def test_requests_are_allowed_again_at_the_rate(self):
+        self.send(10, at=1009.9)
+
+        # 5 seconds later, half of the previous window has slid out
+        allowed, _ = self.send(10, at=1015.0)
+        self.assertEqual(allowed, 5)
+
+    def test_rejected_requests_are_not_counted(self):
+        self.send(10, at=1000.0)
+        self.send(100, at=1005.0)
+
+        # The next window only counts the 10 allowed requests
+        allowed, _ = self.send(10, at=1015.0)
+        self.assertEqual(allowed, 5)
+
+    @override_settings(EVENTS_SEARCH_THROTTLE_RATE=0)
+    def test_rate_0_disables_the_throttle(self):
+        allowed, _ = self.send(100, at=1000.0)
+
+        self.assertEqual(allowed, 100)
@@ -1,13 +1,19 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
+from .rest.views.change import ChangesView
 from .rest.views.event import EventsView
+from .rest.views.export import EventsExportView
+from .rest.views.zone import ZonesView
 
 app_name = 'events_integration'
 
 router = DefaultRouter()
 
 router.register(r'events/search', EventsView, basename='events')
+router.register(r'events/export', EventsExportView, basename='events-export')
+router.register(r'zones/search', ZonesView, basename='zones')
+router.register(r'changes', ChangesView, basename='changes')
 
 urlpatterns = [
     path('', include(router.urls)),